@@ -0,0 +1 @@
+"""Mediciones de rendimiento del inventario con datos sintéticos (fuera de Streamlit)."""
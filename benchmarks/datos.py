@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from inventario.esquema import CATEGORIA_OPCIONES, PRESENTACION_OPCIONES
+from inventario.reportes import write_excel
+
+# Fracción de movimientos con un ID que no existe en el catálogo
+FRACCION_IDS_INVALIDOS = 0.01
+# Sesgo de la popularidad de los productos (ley de Zipf): pocos productos concentran los movimientos
+EXPONENTE_ZIPF = 1.1
+
+
+def generate_catalog(n_skus, seed=0):
+    """
+    Catálogo sintético con las columnas del archivo de inventario inicial
+    (ID, Producto, Stock Inicial, Categoría, Presentación).
+    """
+    rng = np.random.default_rng(seed)
+    categorias = rng.integers(0, len(CATEGORIA_OPCIONES), n_skus)
+    numeros = np.arange(n_skus)
+    ids = pd.Series(categorias + 1).astype(str).str.zfill(2) + '-' + pd.Series(numeros).astype(str).str.zfill(7)
+    return pd.DataFrame({
+        'ID': ids,
+        'Producto': 'PRODUCTO ' + pd.Series(numeros).astype(str),
+        'Stock Inicial': rng.integers(0, 100_000, n_skus),
+        'Categoría': np.array(CATEGORIA_OPCIONES, dtype=object)[categorias],
+        'Presentación': np.array(PRESENTACION_OPCIONES, dtype=object)[rng.integers(0, len(PRESENTACION_OPCIONES), n_skus)],
+    })
+
+
+def generate_movements(catalogo, n_movimientos, columna_cantidad='Cantidad', dias=90, claves=False, seed=1):
+    """
+    Movimientos sintéticos (ID, <columna_cantidad>, Fecha y, opcionalmente, Clave)
+    sobre los IDs del catálogo, con popularidad sesgada, fechas repartidas en los
+    últimos `dias` días y una pequeña fracción de IDs inexistentes.
+    """
+    rng = np.random.default_rng(seed)
+    ids = catalogo['ID'].to_numpy()
+    # Posición en el catálogo según una distribución de Zipf truncada al tamaño del catálogo
+    posiciones = (rng.zipf(EXPONENTE_ZIPF, n_movimientos) - 1) % len(ids)
+    movimientos_ids = ids[rng.permutation(len(ids))][posiciones].astype(object)
+    invalidos = rng.random(n_movimientos) < FRACCION_IDS_INVALIDOS
+    movimientos_ids[invalidos] = 'XX-' + pd.Series(rng.integers(0, 10**6, int(invalidos.sum()))).astype(str).to_numpy()
+
+    hoy = pd.Timestamp.today().normalize()
+    segundos = rng.integers(0, dias * 86_400, n_movimientos)
+    df = pd.DataFrame({
+        'ID': movimientos_ids,
+        columna_cantidad: rng.integers(1, 50, n_movimientos),
+        'Fecha': hoy - pd.to_timedelta(segundos, unit='s'),
+    })
+    if claves:
+        df['Clave'] = pd.Series(rng.permutation(n_movimientos)).astype(str).to_numpy()
+    return df
+
+
+def write_table(df, path):
+    """Escribe df como .csv o .xlsx según la extensión de `path`."""
+    if path.endswith('.csv'):
+        df.to_csv(path, index=False)
+    else:
+        write_excel(df, path, sheet_name='Hoja1')
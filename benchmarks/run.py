@@ -0,0 +1,219 @@
+"""
+Mide los caminos críticos del inventario con datos sintéticos, fuera de Streamlit:
+carga inicial, procesamiento masivo de ventas y compras (process_location_movements,
+el mismo que usan process_sales_from_df y process_purchases_from_df), datos del Dashboard, registro
+manual de productos y movimientos, y generación de reportes.
+
+Uso (desde la raíz del repositorio):
+
+    python -m benchmarks.run --skus 100000 --movimientos 1000000 --salida resultados.json
+
+El resultado es un JSON con los parámetros, el entorno y, por etapa, el tiempo, las
+filas procesadas, las filas por segundo y el pico de memoria (tracemalloc).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.datos import generate_catalog, generate_movements, write_table
+from inventario.cache import load_snapshot, read_table
+from inventario.dashboard import dashboard_data
+from inventario.esquema import COLUMNAS_INVENTARIO, SUCURSAL_PRINCIPAL, history_frame
+from inventario.historial import HistoryBuffer
+from inventario.importacion import read_initial_inventory
+from inventario.ingesta import stream_movements
+from inventario.movimientos import TIPOS_MOVIMIENTO
+from inventario.persistencia import Ledger
+from inventario.pronostico import PLAZO_ENTREGA_DIAS, DemandForecast
+from inventario.reportes import write_report
+from inventario.sucursales import LocationInventory, process_location_movements
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Filas máximas de una hoja de Excel (sin la cabecera)
+EXCEL_MAX_FILAS = 1_048_575
+
+# Columna de cantidad de cada tipo de movimiento, como en los archivos mensuales
+COLUMNAS_CANTIDAD = {'venta': 'Cantidad Vendida', 'compra': 'Cantidad Comprada'}
+
+
+class Benchmark:
+    """Acumula las mediciones de cada etapa."""
+
+    def __init__(self, memoria=True):
+        self.memoria = memoria
+        self.etapas = []
+
+    @contextmanager
+    def stage(self, nombre, filas):
+        if self.memoria:
+            tracemalloc.start()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            pico = None
+            if self.memoria:
+                pico = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            self.etapas.append({
+                'etapa': nombre,
+                'segundos': round(segundos, 4),
+                'filas': filas,
+                'filas_por_segundo': round(filas / segundos) if segundos > 0 else None,
+                'memoria_pico_mb': None if pico is None else round(pico / 2**20, 1),
+            })
+            print(f"{nombre:<40} {segundos:9.3f} s {filas:>12,} filas", file=sys.stderr)
+
+
+def run(skus, movimientos, formato='xlsx', registros=200, claves=False, memoria=True, seed=0):
+    """Ejecuta todas las etapas en una carpeta temporal y devuelve el resultado (dict)."""
+    if formato == 'xlsx' and movimientos > EXCEL_MAX_FILAS:
+        formato = 'csv'
+    bench = Benchmark(memoria)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        # --- Datos sintéticos (no se miden) ---
+        catalogo = generate_catalog(skus, seed)
+        ruta_catalogo = os.path.join(carpeta, 'inventario_inicial.xlsx')
+        write_table(catalogo, ruta_catalogo)
+        rutas = {}
+        for i, tipo in enumerate(TIPOS_MOVIMIENTO):
+            df = generate_movements(catalogo, movimientos, COLUMNAS_CANTIDAD[tipo], claves=claves, seed=seed + i + 1)
+            rutas[tipo] = os.path.join(carpeta, f"{tipo}s.{formato}")
+            write_table(df, rutas[tipo])
+            del df
+
+        # --- Carga inicial ---
+        ledger = Ledger(os.path.join(carpeta, 'inventario.db'))
+        cache_dir = os.path.join(carpeta, 'snapshots')
+        with bench.stage('carga_inicial.lectura', skus):
+            df_inicial, _ = load_snapshot(ruta_catalogo, read_initial_inventory, cache_dir=cache_dir)
+        with bench.stage('carga_inicial.registro', skus):
+            ledger.add_products(df_inicial)
+        with bench.stage('carga_inicial.sesion', skus):
+            _, df_total, por_sucursal = ledger.load_inventory_by_location()
+            sucursales = LocationInventory(df_total, por_sucursal)
+            store = sucursales.total
+            historiales = {tipo: HistoryBuffer(ledger.load_history(tipo)) for tipo in TIPOS_MOVIMIENTO}
+        del df_inicial, df_total, por_sucursal
+
+        # --- Procesamiento masivo (process_sales_from_df / process_purchases_from_df) ---
+        for tipo in TIPOS_MOVIMIENTO:
+            def procesar(bloque, tipo=tipo):
+                return process_location_movements(
+                    ledger, sucursales, bloque, tipo, SUCURSAL_PRINCIPAL, historiales=[historiales[tipo]]
+                )
+
+            if formato == 'csv':
+                with bench.stage(f"{tipo}s.csv_por_bloques", movimientos):
+                    stream_movements(rutas[tipo], procesar)
+            else:
+                with bench.stage(f"{tipo}s.lectura", movimientos):
+                    df_movimientos = read_table(rutas[tipo])
+                with bench.stage(f"{tipo}s.proceso", movimientos):
+                    procesar(df_movimientos)
+                del df_movimientos
+
+        # --- Dashboard ---
+        pronostico = DemandForecast()
+        cache = {}
+        ventas, compras = historiales['venta'], historiales['compra']
+        with bench.stage('dashboard.inicial', skus):
+            dashboard_data(store, cache, ventas, compras, pronostico, PLAZO_ENTREGA_DIAS)
+        producto = store.get(store.ids()[0])
+        sucursales.adjust(SUCURSAL_PRINCIPAL, producto['ID'], stock=-1, ventas=1)
+        ventas.append(producto['ID'], producto['Producto'], 1, pd.Timestamp.now().floor('s'))
+        with bench.stage('dashboard.tras_una_venta', skus):
+            dashboard_data(store, cache, ventas, compras, pronostico, PLAZO_ENTREGA_DIAS)
+
+        # --- Registro manual (add_product y register_movement) ---
+        with bench.stage('registro_manual.productos', registros):
+            for i in range(registros):
+                nuevo = {
+                    'ID': f"ZZ-{i:07d}", 'Producto': f"MANUAL {i}", 'Stock': 10,
+                    'Categoría': catalogo['Categoría'].iat[0], 'Presentación': 'unidad', 'Ventas': 0, 'Compras': 0,
+                }
+                ledger.add_products(pd.DataFrame([nuevo], columns=COLUMNAS_INVENTARIO))
+                sucursales.add(nuevo, SUCURSAL_PRINCIPAL)
+        ids = store.ids()
+        with bench.stage('registro_manual.movimientos', registros):
+            for i in range(registros):
+                producto = store.get(ids[i % len(ids)])
+                df_hist = history_frame(pd.DataFrame([{'ID': producto['ID'], 'Producto': producto['Producto'], 'Cantidad': 1}]))
+                ledger.record_movements('venta', df_hist)
+                sucursales.adjust(SUCURSAL_PRINCIPAL, producto['ID'], stock=-1, ventas=1)
+                ventas.append(producto['ID'], producto['Producto'], 1, df_hist.at[0, 'Fecha'])
+
+        # --- Reportes (antes to_excel) ---
+        for nombre, df in (('inventario', store.df), ('ventas', ventas.frame())):
+            for formato_reporte in ('xlsx', 'csv'):
+                if formato_reporte == 'xlsx' and len(df) > EXCEL_MAX_FILAS:
+                    continue
+                with bench.stage(f"reporte.{nombre}.{formato_reporte}", len(df)):
+                    write_report(df, formato_reporte, os.path.join(carpeta, f"{nombre}.{formato_reporte}"))
+
+    maxrss = None
+    if resource is not None:
+        # ru_maxrss está en KB en Linux y en bytes en macOS
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        maxrss = round(maxrss / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+    return {
+        'parametros': {
+            'skus': skus, 'movimientos': movimientos, 'formato': formato,
+            'registros': registros, 'claves': claves, 'memoria': memoria, 'seed': seed,
+        },
+        'entorno': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'etapas': bench.etapas,
+        'memoria_maxima_proceso_mb': maxrss,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del inventario con datos sintéticos.")
+    parser.add_argument('--skus', type=int, default=10_000, help="Productos del catálogo (1k a 1M).")
+    parser.add_argument('--movimientos', type=int, default=100_000, help="Ventas y compras por archivo (10k a 10M).")
+    parser.add_argument('--formato', choices=['xlsx', 'csv'], default='xlsx',
+                        help="Formato de los archivos de movimientos (csv si superan el límite de Excel).")
+    parser.add_argument('--registros', type=int, default=200, help="Registros manuales a medir.")
+    parser.add_argument('--claves', action='store_true', help="Incluir una columna Clave por movimiento.")
+    parser.add_argument('--sin-memoria', action='store_true',
+                        help="No medir el pico de memoria (tracemalloc ralentiza las etapas).")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--salida', help="Archivo JSON de resultados (por defecto, la salida estándar).")
+    args = parser.parse_args(argv)
+
+    resultado = run(
+        args.skus, args.movimientos, formato=args.formato, registros=args.registros,
+        claves=args.claves, memoria=not args.sin_memoria, seed=args.seed,
+    )
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto + '\n')
+    else:
+        print(texto)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Lógica de inventario independiente de la interfaz de Streamlit."""
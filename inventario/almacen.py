@@ -0,0 +1,210 @@
+import itertools
+
+import pandas as pd
+
+from inventario.esquema import COLUMNAS_INVENTARIO, concat_inventory, inventory_frame, normalize_id
+from inventario.indices import ProductSearchIndex, SortedColumnIndex
+
+# Columnas con índice ordenado para las consultas top-N y de bajo stock
+COLUMNAS_ORDENADAS = ['Stock', 'Ventas', 'Compras']
+
+# Sugerencias que devuelve por defecto la búsqueda de productos
+LIMITE_BUSQUEDA = 50
+
+# Productos de un lote del catálogo a partir de los cuales el índice de búsqueda se
+# reconstruye en lugar de actualizarse producto a producto
+MAX_CAMBIOS_INCREMENTALES = 1000
+
+# Contador global: cada cambio en cualquier InventoryStore recibe una versión distinta
+_versiones = itertools.count(1)
+
+
+class InventoryAggregates:
+    """
+    KPIs del inventario (stock total, productos únicos, productos por categoría)
+    mantenidos de forma incremental: InventoryStore los actualiza en cada cambio,
+    de modo que el Dashboard no tiene que recorrer el inventario para mostrarlos.
+    """
+
+    def __init__(self, df):
+        self.rebuild(df)
+
+    def rebuild(self, df):
+        """Recalcula todo a partir del DataFrame (carga inicial o procesamiento masivo)."""
+        self.total_stock = int(pd.to_numeric(df['Stock']).sum()) if not df.empty else 0
+        self._productos = df['Producto'].value_counts().to_dict()
+        categorias = df['Categoría'].value_counts()
+        # En una columna categórica value_counts incluye las categorías sin productos
+        self._categorias = categorias[categorias > 0].to_dict()
+
+    @property
+    def unique_products(self):
+        return len(self._productos)
+
+    def adjust_stock(self, cantidad):
+        self.total_stock += int(cantidad)
+
+    def add_product(self, product):
+        self.total_stock += int(product['Stock'])
+        _increment(self._productos, product['Producto'], 1)
+        _increment(self._categorias, product['Categoría'], 1)
+
+    def category_counts(self):
+        """Productos por categoría, como el groupby('Categoría').size() del Dashboard."""
+        return (
+            pd.Series(self._categorias, dtype=int)
+            .rename_axis('Categoría')
+            .sort_index()
+            .reset_index(name='Count')
+        )
+
+
+def _increment(conteos, clave, cantidad):
+    # Igual que value_counts/groupby, los valores vacíos no se cuentan
+    if pd.isna(clave):
+        return
+    conteos[clave] = conteos.get(clave, 0) + cantidad
+    if conteos[clave] <= 0:
+        del conteos[clave]
+
+
+class InventoryStore:
+    """
+    Inventario indexado por ID normalizado.
+
+    Mantiene el DataFrame del inventario junto a un diccionario ID -> posición,
+    de modo que consultar o ajustar un producto no recorre todo el inventario.
+    La propiedad `df` devuelve el DataFrame interno sin copiarlo. `version` cambia
+    con cada modificación, para poder reutilizar cálculos hechos sobre el inventario.
+    Stock, Ventas y Compras tienen además un índice ordenado (ver `top`),
+    y el ID y el nombre un índice de búsqueda (ver `search`) que se construye la
+    primera vez que se busca y luego se actualiza al añadir o eliminar productos.
+    """
+
+    def __init__(self, df=None):
+        self._df = None
+        self._posiciones = {}
+        self.aggregates = None
+        self.indices = {}
+        self._busqueda = None
+        self.version = None
+        self.replace(df if df is not None else pd.DataFrame(columns=COLUMNAS_INVENTARIO))
+
+    @property
+    def df(self):
+        """DataFrame del inventario (solo lectura; usar los métodos para modificarlo)."""
+        return self._df
+
+    @property
+    def empty(self):
+        return self._df.empty
+
+    def __len__(self):
+        return len(self._df)
+
+    def __contains__(self, product_id):
+        return normalize_id(product_id) in self._posiciones
+
+    def ids(self):
+        """Lista de IDs en el orden del inventario."""
+        return list(self._posiciones)
+
+    def replace(self, df):
+        """Sustituye todo el inventario (carga inicial o procesamiento masivo)."""
+        self._set_frame(inventory_frame(df))
+        if self.aggregates is None:
+            self.aggregates = InventoryAggregates(self._df)
+        else:
+            self.aggregates.rebuild(self._df)
+
+    def _set_frame(self, df):
+        self._df = df.reset_index(drop=True)
+        self._posiciones = {}
+        for posicion, product_id in enumerate(self._df['ID']):
+            # Si un ID está repetido, cuenta solo su primera aparición
+            self._posiciones.setdefault(product_id, posicion)
+        # Las posiciones cambian: los índices ordenados se reconstruyen
+        self.indices = {columna: SortedColumnIndex(self._df[columna]) for columna in COLUMNAS_ORDENADAS}
+        # El índice de búsqueda va por ID, no por posición: solo se descarta si cambian los datos
+        self._busqueda = None
+        self.version = next(_versiones)
+
+    def get(self, product_id):
+        """Devuelve los datos del producto como diccionario, o None si el ID no existe."""
+        posicion = self._posiciones.get(normalize_id(product_id))
+        if posicion is None:
+            return None
+        return self._df.iloc[posicion].to_dict()
+
+    def adjust(self, product_id, stock=0, ventas=0, compras=0):
+        """Suma las cantidades indicadas a Stock/Ventas/Compras del producto y devuelve el nuevo stock."""
+        posicion = self._posiciones[normalize_id(product_id)]
+        for columna, cantidad in (('Stock', stock), ('Ventas', ventas), ('Compras', compras)):
+            if cantidad:
+                col = self._df.columns.get_loc(columna)
+                anterior = self._df.iat[posicion, col]
+                self._df.iat[posicion, col] = anterior + cantidad
+                self.indices[columna].update(posicion, anterior, anterior + cantidad)
+        self.aggregates.adjust_stock(stock)
+        self.version = next(_versiones)
+        return self._df.iat[posicion, self._df.columns.get_loc('Stock')]
+
+    def add(self, product):
+        """Añade un producto (diccionario con las columnas del inventario)."""
+        product_id = normalize_id(product['ID'])
+        if product_id in self._posiciones:
+            raise KeyError(product_id)
+        new_row = pd.DataFrame([{**product, 'ID': product_id}], columns=COLUMNAS_INVENTARIO)
+        self._df = concat_inventory(self._df, new_row)
+        self._posiciones[product_id] = len(self._df) - 1
+        for columna, indice in self.indices.items():
+            indice.add(len(self._df) - 1, product[columna])
+        self.aggregates.add_product(product)
+        if self._busqueda is not None:
+            self._busqueda.add(product_id, product['Producto'])
+        self.version = next(_versiones)
+
+    def apply_changes(self, altas, cambios, bajas):
+        """
+        Aplica de una vez un lote del catálogo (ver inventario.catalogo.CatalogChanges):
+        elimina las bajas, actualiza los datos descriptivos de los cambios y añade las
+        altas, reconstruyendo el DataFrame, los índices y los KPIs una sola vez.
+        """
+        ids_bajas = {normalize_id(pid) for pid in bajas}
+        df = self._df[~self._df['ID'].isin(ids_bajas)] if ids_bajas else self._df
+        if not cambios.empty:
+            df = df.copy()
+            nuevos = cambios.drop_duplicates('ID').set_index('ID')
+            for columna in nuevos.columns:
+                valores = df['ID'].map(nuevos[columna].dropna())
+                if valores.notna().any():
+                    # Como objeto: inventory_frame rehace las categorías con los valores nuevos
+                    df[columna] = valores.where(valores.notna(), df[columna].astype(object))
+            df = inventory_frame(df)
+        if not altas.empty:
+            df = concat_inventory(df, altas)
+
+        busqueda = self._busqueda
+        tocados = ids_bajas | set(cambios['ID'])
+        self._set_frame(df)
+        self.aggregates.rebuild(self._df)
+        # El índice de búsqueda se actualiza en el sitio si el lote es pequeño; si no,
+        # se descarta y se reconstruye en la próxima búsqueda
+        if busqueda is not None and len(tocados) + len(altas) <= MAX_CAMBIOS_INCREMENTALES:
+            busqueda.remove(tocados)
+            for product_id in tocados - ids_bajas:
+                if product_id in self._posiciones:
+                    busqueda.add(product_id, self._df.at[self._posiciones[product_id], 'Producto'])
+            for product_id, nombre in zip(altas['ID'], altas['Producto']):
+                busqueda.add(product_id, nombre)
+            self._busqueda = busqueda
+
+    def search(self, texto, limite=LIMITE_BUSQUEDA):
+        """IDs de los productos cuyo ID o nombre coincide con `texto` (ver ProductSearchIndex.search)."""
+        if self._busqueda is None:
+            self._busqueda = ProductSearchIndex(self._df['ID'], self._df['Producto'])
+        return self._busqueda.search(texto, limite)
+
+    def top(self, columna, k):
+        """Los k productos con mayor valor en `columna` (Stock, Ventas o Compras), de mayor a menor."""
+        return self._df.iloc[self.indices[columna].largest(k)]
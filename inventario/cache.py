@@ -0,0 +1,133 @@
+import collections
+import copy
+import hashlib
+import os
+import pickle
+import threading
+
+import pandas as pd
+
+from inventario import metricas
+
+# Carpeta (compartida por todas las sesiones y procesos) donde se guardan las copias ya procesadas
+CACHE_DIR = os.path.join('.cache', 'snapshots')
+# Versión del formato de las copias: se incrementa al cambiar su contenido (p. ej. la
+# tupla guardada) para que no se reutilicen copias de la versión anterior
+VERSION_FORMATO = 1
+# Copias que se mantienen en memoria en este proceso (las menos usadas se descartan)
+MAX_COPIAS_EN_MEMORIA = 8
+
+# Copias ya cargadas en este proceso, de la menos a la más usada:
+# ruta del snapshot -> (mtime_ns, tamaño, hash, DataFrame)
+_memoria = collections.OrderedDict()
+# Huellas ya calculadas en este proceso: ruta absoluta -> (mtime_ns, tamaño, hash)
+_huellas = {}
+_lock = threading.Lock()
+
+
+def read_table(path):
+    """Lee un archivo .csv o .xlsx completo en un DataFrame."""
+    if path.endswith('.csv'):
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+
+def file_hash(path):
+    """Hash SHA-256 del contenido de un archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for bloque in iter(lambda: f.read(1 << 20), b''):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """
+    Huella del contenido de un archivo (file_hash). Se recuerda por ruta, mtime y
+    tamaño, así que consultar de nuevo un archivo sin cambios no lo vuelve a leer.
+    """
+    stat = os.stat(path)
+    clave = os.path.abspath(path)
+    with _lock:
+        entrada = _huellas.get(clave)
+    if entrada is None or entrada[:2] != (stat.st_mtime_ns, stat.st_size):
+        entrada = (stat.st_mtime_ns, stat.st_size, file_hash(path))
+        with _lock:
+            _huellas[clave] = entrada
+    return entrada[2]
+
+
+def _snapshot_path(path, parse, cache_dir):
+    # La versión del formato y el código de parse forman parte de la clave: si cambia
+    # alguno, las copias generadas por la versión anterior no se reutilizan
+    codigo = getattr(getattr(parse, '__code__', None), 'co_code', b'')
+    clave = (f"v{VERSION_FORMATO}|{os.path.abspath(path)}|{parse.__module__}.{parse.__qualname__}"
+             f"|{hashlib.sha1(codigo).hexdigest()}")
+    return os.path.join(cache_dir, hashlib.sha1(clave.encode()).hexdigest() + '.pkl')
+
+
+def load_snapshot(path, parse=read_table, cache_dir=CACHE_DIR):
+    """
+    Devuelve parse(path) reutilizando una copia binaria (pickle) guardada en disco.
+
+    La copia es válida mientras el archivo no cambie: primero se compara mtime y
+    tamaño, y si no coinciden se compara el hash del contenido antes de volver a
+    procesar el archivo. Lanza FileNotFoundError si el archivo no existe.
+    El resultado es una copia superficial (elemento a elemento si parse devuelve una
+    tupla): modificarlo no altera la caché.
+    """
+    stat = os.stat(path)
+    snapshot = _snapshot_path(path, parse, cache_dir)
+
+    # El candado solo protege el diccionario: la lectura y el procesamiento del archivo
+    # se hacen fuera, así una carga lenta no bloquea a las demás sesiones
+    with _lock:
+        entrada = _memoria.get(snapshot)
+    if entrada is None and os.path.exists(snapshot):
+        try:
+            with open(snapshot, 'rb') as f:
+                entrada = pickle.load(f)
+        except Exception:
+            # Copia dañada o de otra versión de pandas: se vuelve a generar
+            entrada = None
+
+    if entrada is not None:
+        mtime_ns, size, digest, df = entrada
+        if (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+            # Archivo tocado: solo se reprocesa si su contenido cambió de verdad
+            if size != stat.st_size or digest != file_hash(path):
+                entrada = None
+            else:
+                entrada = (stat.st_mtime_ns, stat.st_size, digest, df)
+                _save(snapshot, entrada)
+
+    if entrada is None:
+        digest = file_hash(path)
+        with metricas.section('lectura.archivo'):
+            df = parse(path)
+        entrada = (stat.st_mtime_ns, stat.st_size, digest, df)
+        _save(snapshot, entrada)
+
+    with _lock:
+        _memoria[snapshot] = entrada
+        _memoria.move_to_end(snapshot)
+        while len(_memoria) > MAX_COPIAS_EN_MEMORIA:
+            _memoria.popitem(last=False)
+    return _shallow_copy(entrada[3])
+
+
+def _shallow_copy(valor):
+    if isinstance(valor, tuple):
+        return tuple(_shallow_copy(v) for v in valor)
+    if isinstance(valor, pd.DataFrame):
+        return valor.copy(deep=False)
+    return copy.copy(valor)
+
+
+def _save(snapshot, entrada):
+    """Escribe la copia de forma atómica para que otro proceso o hilo nunca lea un archivo a medias."""
+    os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+    temporal = f"{snapshot}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporal, 'wb') as f:
+        pickle.dump(entrada, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, snapshot)
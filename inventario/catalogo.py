@@ -0,0 +1,120 @@
+import pandas as pd
+
+from inventario.esquema import COLUMNAS_INVENTARIO, inventory_frame, normalize_ids
+from inventario.validacion import format_row_error, select_columns, validate_rows
+
+# Columnas descriptivas que un cambio de catálogo puede modificar en un producto existente
+# (el stock de los productos existentes solo cambia con ventas y compras)
+COLUMNAS_CAMBIO = ['ID', 'Producto', 'Categoría', 'Presentación']
+
+
+class CatalogChanges:
+    """
+    Altas, cambios y bajas de productos ya validados contra el inventario, listos para
+    aplicarse juntos (Ledger.apply_catalog_changes y InventoryStore.apply_changes).
+
+    - altas: productos nuevos, con las columnas del inventario.
+    - cambios: ID y los valores nuevos de COLUMNAS_CAMBIO (None: se conserva el actual).
+    - bajas: IDs a eliminar.
+    - rechazadas: mensajes de las filas o IDs que no se aplicarán.
+    """
+
+    def __init__(self, altas=None, cambios=None, bajas=(), rechazadas=()):
+        self.altas = inventory_frame(pd.DataFrame(columns=COLUMNAS_INVENTARIO)) if altas is None else altas
+        self.cambios = pd.DataFrame(columns=COLUMNAS_CAMBIO) if cambios is None else cambios
+        self.bajas = list(bajas)
+        self.rechazadas = list(rechazadas)
+
+    @property
+    def empty(self):
+        return self.altas.empty and self.cambios.empty and not self.bajas
+
+    def summary(self):
+        """Texto breve con el número de altas, cambios y bajas."""
+        return f"{len(self.altas)} altas, {len(self.cambios)} cambios y {len(self.bajas)} bajas"
+
+
+def plan_catalog_changes(ids_existentes, df_catalogo=None, bajas=()):
+    """
+    Clasifica en una sola pasada las filas de un catálogo (archivo o tabla editable,
+    esquema 'catalogo' de inventario.validacion) y una lista de IDs a eliminar:
+
+    - las filas con ELIMINAR marcado y los IDs de `bajas` son bajas;
+    - las filas con un ID de `ids_existentes` son cambios de sus datos descriptivos;
+    - el resto son altas, que necesitan al menos el nombre del producto.
+
+    Los IDs se comparan contra un conjunto (hash), no recorriendo el inventario. Un ID
+    repetido en el catálogo, una baja de un ID inexistente o un ID que aparece a la vez
+    como baja y como alta o cambio se rechazan. Devuelve (CatalogChanges, error); error
+    indica una columna obligatoria que falta en el catálogo.
+    """
+    existentes = ids_existentes if isinstance(ids_existentes, (set, frozenset, dict)) else set(ids_existentes)
+    rechazadas = []
+
+    if df_catalogo is not None and not df_catalogo.empty:
+        df, error = select_columns(df_catalogo.reset_index(drop=True), 'catalogo')
+        if error:
+            return CatalogChanges(), error
+        df, rechazadas = validate_rows(df, 'catalogo')
+        df = df.reindex(columns=['ID', 'PRODUCTO', 'STOCK_INICIAL', 'CATEGORIA', 'PRESENTACION', 'ELIMINAR'])
+        df['STOCK_INICIAL'] = df['STOCK_INICIAL'].fillna(0)
+        df['ELIMINAR'] = df['ELIMINAR'].fillna(False).astype(bool)
+
+        repetidas = df['ID'].duplicated(keep='first')
+        if repetidas.any():
+            rechazadas.append(format_row_error('ID', "repetido en el catálogo (se usa su primera fila)", df.loc[repetidas, 'ID']))
+            df = df[~repetidas]
+    else:
+        df = pd.DataFrame(columns=['ID', 'PRODUCTO', 'STOCK_INICIAL', 'CATEGORIA', 'PRESENTACION', 'ELIMINAR'])
+
+    existe = df['ID'].isin(existentes)
+    eliminar = df['ELIMINAR'].astype(bool)
+    inexistentes = eliminar & ~existe
+    if inexistentes.any():
+        rechazadas.append(format_row_error('ID', "no existe en el inventario y no se puede eliminar", df.loc[inexistentes, 'ID']))
+
+    ids_bajas = list(dict.fromkeys(df.loc[eliminar & existe, 'ID']))
+    faltantes = []
+    for product_id in normalize_ids(list(bajas)):
+        if not product_id:
+            continue
+        if product_id in existentes:
+            ids_bajas.append(product_id)
+        else:
+            faltantes.append(product_id)
+    ids_bajas = list(dict.fromkeys(ids_bajas))
+    if faltantes:
+        rechazadas.append(f"IDs a eliminar que no existen en el inventario: {', '.join(dict.fromkeys(faltantes))}")
+
+    df = df[~eliminar]
+    en_conflicto = df['ID'].isin(set(ids_bajas))
+    if en_conflicto.any():
+        rechazadas.append(format_row_error('ID', "también está marcado para eliminar (se elimina)", df.loc[en_conflicto, 'ID']))
+        df = df[~en_conflicto]
+
+    existe = df['ID'].isin(existentes)
+    sin_nombre = ~existe & df['PRODUCTO'].isna()
+    if sin_nombre.any():
+        rechazadas.append(format_row_error('PRODUCTO', "vacío (obligatorio para productos nuevos)", df.loc[sin_nombre, 'ID']))
+
+    nuevas = df[~existe & ~sin_nombre]
+    altas = inventory_frame(pd.DataFrame({
+        'ID': nuevas['ID'],
+        'Producto': nuevas['PRODUCTO'],
+        'Stock': nuevas['STOCK_INICIAL'],
+        'Categoría': nuevas['CATEGORIA'],
+        'Presentación': nuevas['PRESENTACION'],
+        'Ventas': 0,
+        'Compras': 0
+    }, columns=COLUMNAS_INVENTARIO).reset_index(drop=True))
+
+    # Un cambio sin ningún valor nuevo no modifica nada
+    modificadas = df[existe].dropna(subset=['PRODUCTO', 'CATEGORIA', 'PRESENTACION'], how='all')
+    cambios = pd.DataFrame({
+        'ID': modificadas['ID'],
+        'Producto': modificadas['PRODUCTO'],
+        'Categoría': modificadas['CATEGORIA'],
+        'Presentación': modificadas['PRESENTACION'],
+    }, columns=COLUMNAS_CAMBIO).astype(object).reset_index(drop=True)
+
+    return CatalogChanges(altas, cambios, ids_bajas, rechazadas), None
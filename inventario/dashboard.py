@@ -0,0 +1,57 @@
+import pandas as pd
+import plotly.express as px
+
+
+def build_figures(store, historial_ventas=None):
+    """
+    Construye las figuras del Dashboard a partir de los índices del inventario y, si
+    se indica, de los totales mensuales del historial de ventas.
+    """
+    df_stock_sorted = store.top('Stock', 10)
+    df_ventas = store.top('Ventas', 5)
+    df_compras = store.top('Compras', 5)
+
+    figuras = {
+        'stock': px.bar(df_stock_sorted, x='Producto', y='Stock', text='Stock',
+                        title="Stock (Unidades)", color='Producto', height=350),
+        'categoria': px.pie(store.aggregates.category_counts(), names='Categoría', values='Count',
+                            title='Productos por Categoría', height=350),
+        'ventas': px.bar(df_ventas, x='Producto', y='Ventas', text='Ventas',
+                         title="Top 5 Ventas (Unidades Vendidas)", color='Producto', height=350),
+        'compras': px.bar(df_compras, x='Producto', y='Compras', text='Compras',
+                          title="Top 5 Compras (Unidades Compradas)", color='Producto', height=350),
+    }
+    if historial_ventas is not None:
+        ventas_mes = historial_ventas.totals('M').groupby('Periodo', as_index=False)['Cantidad'].sum()
+        figuras['ventas_mes'] = px.bar(ventas_mes, x='Periodo', y='Cantidad', text='Cantidad',
+                                       title="Ventas por Mes (Unidades)", height=350)
+    return figuras
+
+
+def latency_figure(seccion):
+    """Histograma de latencias de una sección de metricas.snapshot()."""
+    histograma = seccion['histograma']
+    return px.bar(x=list(histograma), y=list(histograma.values()), labels={'x': 'Duración', 'y': 'Llamadas'},
+                  title=f"Latencia de '{seccion['seccion']}'", height=350)
+
+
+def dashboard_data(store, cache, historial_ventas, historial_compras, pronostico, plazo):
+    """
+    Devuelve los datos del Dashboard reutilizando lo ya calculado en `cache` (un dict
+    de la sesión). Las figuras solo se reconstruyen si cambió la versión del
+    inventario (toda venta la cambia), y la lista de productos a reordenar
+    (DemandForecast) si cambió además el plazo de entrega o el día.
+    """
+    if cache.get('version') != store.version:
+        cache.clear()
+        cache['version'] = store.version
+        cache['figuras'] = build_figures(store, historial_ventas)
+
+    clave = (plazo, pd.Timestamp.today().normalize())
+    if cache.get('reorden') != clave:
+        cache['reorden'] = clave
+        cache['bajo_stock'] = pronostico.reorder_list(
+            store.df[['ID', 'Producto', 'Stock', 'Categoría']], historial_ventas, historial_compras, plazo
+        )
+
+    return cache
@@ -0,0 +1,115 @@
+import sys
+
+import pandas as pd
+
+# Definición de las opciones de Presentación y Categoría
+PRESENTACION_OPCIONES = ['libra', 'kilogramo', 'litro', 'paquete', 'unidad']
+CATEGORIA_OPCIONES = [
+    'Harinas',
+    'Margarinas',
+    'Embutidos',
+    'Esencias y colorantes',
+    'Salsas y conservas',
+    'Varios y acompañantes, Panadería y pastelería',
+    'Lácteos',
+    'Desechables',
+    'Moldes, motivos y utensilios'
+]
+
+# Sucursal que recibe el inventario inicial y los movimientos que no indican otra
+SUCURSAL_PRINCIPAL = 'Principal'
+
+COLUMNAS_INVENTARIO = ['ID', 'Producto', 'Stock', 'Categoría', 'Presentación', 'Ventas', 'Compras']
+COLUMNAS_HISTORIAL = ['ID', 'Producto', 'Cantidad', 'Fecha']
+
+# Columnas categóricas del inventario y sus opciones conocidas
+OPCIONES_CATEGORICAS = {
+    'Categoría': CATEGORIA_OPCIONES,
+    'Presentación': PRESENTACION_OPCIONES,
+}
+# Todas las cantidades son enteros de 64 bits (el stock puede ser negativo)
+DTYPE_CANTIDAD = 'int64'
+# Fecha y hora de cada movimiento (hora local, al segundo)
+DTYPE_FECHA = 'datetime64[ns]'
+
+
+def intern_ids(values):
+    """IDs como cadenas internadas: cada ID distinto ocupa memoria una sola vez en toda la sesión."""
+    return pd.Series([sys.intern(str(v)) for v in values], index=getattr(values, 'index', None), dtype=object)
+
+
+def normalize_id(product_id):
+    """Normaliza un ID de producto: texto en mayúsculas y sin espacios alrededor."""
+    return str(product_id).upper().strip()
+
+
+def normalize_ids(values):
+    """Como normalize_id para una serie de IDs, que se devuelven internados (intern_ids)."""
+    return pd.Series(
+        [sys.intern(str(v).upper().strip()) for v in values],
+        index=values.index if isinstance(values, pd.Series) else None,
+        dtype=object,
+    )
+
+
+def _categorical_dtype(values, opciones):
+    # Las opciones van primero; cualquier valor adicional del archivo se conserva
+    extras = sorted(set(values.dropna().unique()) - set(opciones), key=str)
+    return pd.CategoricalDtype(list(opciones) + extras)
+
+
+def _quantity(values):
+    return pd.to_numeric(values, errors='coerce').fillna(0).astype(DTYPE_CANTIDAD)
+
+
+def movement_dates(values):
+    """Fechas de movimientos con el tipo del esquema; las vacías o inválidas toman la hora actual."""
+    ahora = pd.Timestamp.now().floor('s')
+    return pd.to_datetime(values, errors='coerce').fillna(ahora).astype(DTYPE_FECHA)
+
+
+def inventory_frame(df):
+    """Devuelve el inventario con los tipos del esquema (categorías, enteros e IDs normalizados e internados)."""
+    df = df[COLUMNAS_INVENTARIO].copy()
+    df['ID'] = normalize_ids(df['ID'])
+    for columna in ('Stock', 'Ventas', 'Compras'):
+        df[columna] = _quantity(df[columna])
+    for columna, opciones in OPCIONES_CATEGORICAS.items():
+        if not isinstance(df[columna].dtype, pd.CategoricalDtype):
+            df[columna] = df[columna].astype(_categorical_dtype(df[columna], opciones))
+    return df
+
+
+def concat_inventory(df_base, df_nuevo):
+    """Concatena filas nuevas al inventario unificando las categorías, sin perder los tipos."""
+    df_nuevo = inventory_frame(df_nuevo)
+    if df_base.empty:
+        return df_nuevo.reset_index(drop=True)
+    df_base = df_base.copy()
+    for columna in OPCIONES_CATEGORICAS:
+        faltantes = df_nuevo[columna].cat.categories.difference(df_base[columna].cat.categories)
+        if len(faltantes):
+            df_base[columna] = df_base[columna].cat.add_categories(faltantes)
+        df_nuevo[columna] = df_nuevo[columna].astype(object).astype(df_base[columna].dtype)
+    return pd.concat([df_base, df_nuevo], ignore_index=True)
+
+
+def history_frame(df=None):
+    """
+    Historial (ID, Producto, Cantidad, Fecha) con tipos fijos; vacío si no se indica df.
+    Si df no trae 'Fecha', los movimientos se fechan con la hora actual.
+    """
+    if df is None:
+        return pd.DataFrame({
+            'ID': pd.Series(dtype=object),
+            'Producto': pd.Series(dtype=object),
+            'Cantidad': pd.Series(dtype=DTYPE_CANTIDAD),
+            'Fecha': pd.Series(dtype=DTYPE_FECHA),
+        })
+    fechas = df['Fecha'] if 'Fecha' in df.columns else pd.Series(pd.NaT, index=df.index)
+    return pd.DataFrame({
+        'ID': intern_ids(df['ID']).reset_index(drop=True),
+        'Producto': df['Producto'].astype(object).reset_index(drop=True),
+        'Cantidad': _quantity(df['Cantidad']).reset_index(drop=True),
+        'Fecha': movement_dates(fechas).reset_index(drop=True),
+    })
@@ -0,0 +1,181 @@
+import bisect
+
+import pandas as pd
+
+from inventario.esquema import COLUMNAS_HISTORIAL, DTYPE_CANTIDAD, DTYPE_FECHA, history_frame
+
+# Periodos de los totales por producto: diario y mensual
+PERIODOS = ('D', 'M')
+
+
+def _empty_totals():
+    return pd.DataFrame({
+        'Periodo': pd.Series(dtype=DTYPE_FECHA),
+        'ID': pd.Series(dtype=object),
+        'Producto': pd.Series(dtype=object),
+        'Cantidad': pd.Series(dtype=DTYPE_CANTIDAD),
+    })
+
+
+class HistoryBuffer:
+    """
+    Historial de movimientos de solo inserción, particionado por día.
+
+    Cada partición guarda sus lotes como una lista de DataFrames y los movimientos
+    individuales quedan como tuplas pendientes, así que añadir no copia el historial
+    existente. Las consultas por rango de fechas solo arman las particiones del
+    rango, y los totales diarios por producto se calculan una vez por partición y se
+    reutilizan mientras esa partición no cambie.
+    """
+
+    def __init__(self, df=None):
+        self._particiones = {}
+        self._dias = []
+        self._pendientes = []
+        self._totales_dia = {}
+        self._totales = {}
+        self._vista = None
+        self._filas = 0
+        # Cada lote añadido incrementa la revisión; por día se anota solo la última
+        # revisión que lo modificó, así que el registro no crece más que las particiones
+        self._revision = 0
+        self._revision_dia = {}
+        if df is not None:
+            self.extend(df)
+
+    def __len__(self):
+        return self._filas
+
+    @property
+    def revision(self):
+        """Número que aumenta cada vez que cambia el historial."""
+        self._flush()
+        return self._revision
+
+    def first_change_since(self, revision):
+        """Día más antiguo modificado después de `revision`, o None si no hubo cambios."""
+        self._flush()
+        # Los días están ordenados: el primero modificado después de `revision` es el más antiguo
+        return next((dia for dia in self._dias if self._revision_dia[dia] > revision), None)
+
+    def append(self, product_id, producto, cantidad, fecha):
+        """Añade un movimiento individual."""
+        self._pendientes.append((product_id, producto, cantidad, fecha))
+        self._filas += 1
+        self._vista = None
+
+    def extend(self, df_hist):
+        """Añade un lote de movimientos (DataFrame con las columnas del historial)."""
+        if df_hist.empty:
+            return
+        self._flush()
+        # Columnas extra del lote (como 'Clave') no forman parte del historial
+        self._add_block(df_hist[COLUMNAS_HISTORIAL])
+        self._filas += len(df_hist)
+
+    def _add_block(self, df_hist):
+        dias = df_hist['Fecha'].dt.normalize()
+        if dias.min() == dias.max():
+            grupos = [(dias.iloc[0], df_hist)]
+        else:
+            grupos = ((dia, bloque.reset_index(drop=True)) for dia, bloque in df_hist.groupby(dias, sort=False))
+        self._revision += 1
+        for dia, bloque in grupos:
+            if dia not in self._particiones:
+                bisect.insort(self._dias, dia)
+                self._particiones[dia] = []
+            self._particiones[dia].append(bloque)
+            self._totales_dia.pop(dia, None)
+            self._revision_dia[dia] = self._revision
+        self._totales = {}
+        self._vista = None
+
+    def _flush(self):
+        if self._pendientes:
+            bloque = history_frame(pd.DataFrame(self._pendientes, columns=COLUMNAS_HISTORIAL))
+            self._pendientes = []
+            self._add_block(bloque)
+
+    def _partition(self, dia):
+        bloques = self._particiones[dia]
+        if len(bloques) > 1:
+            # Se compacta en un solo bloque para no repetir la concatenación
+            self._particiones[dia] = bloques = [pd.concat(bloques, ignore_index=True)]
+        return bloques[0]
+
+    def _concat(self, dias):
+        partes = [self._partition(dia) for dia in dias]
+        if not partes:
+            return history_frame()
+        return partes[0] if len(partes) == 1 else pd.concat(partes, ignore_index=True)
+
+    def frame(self):
+        """DataFrame con todo el historial, por orden de fecha (solo lectura)."""
+        if self._vista is None:
+            self._flush()
+            self._vista = self._concat(self._dias)
+        return self._vista
+
+    def _days_between(self, inicio, fin):
+        desde = 0 if inicio is None else bisect.bisect_left(self._dias, inicio.normalize())
+        hasta = len(self._dias) if fin is None else bisect.bisect_left(self._dias, fin)
+        return self._dias[desde:hasta]
+
+    def between(self, inicio=None, fin=None):
+        """
+        Movimientos con inicio <= Fecha < fin (None: sin límite). Solo se leen las
+        particiones de los días del rango.
+        """
+        if inicio is None and fin is None:
+            return self.frame()
+        self._flush()
+        inicio = None if inicio is None else pd.Timestamp(inicio)
+        fin = None if fin is None else pd.Timestamp(fin)
+        df = self._concat(self._days_between(inicio, fin))
+
+        # Solo hace falta filtrar por hora si el rango no empieza o termina a medianoche
+        if inicio is not None and inicio != inicio.normalize():
+            df = df[df['Fecha'] >= inicio]
+        if fin is not None and fin != fin.normalize():
+            df = df[df['Fecha'] < fin]
+        return df
+
+    def _daily_totals(self, dia):
+        if dia not in self._totales_dia:
+            totales = self._partition(dia).groupby('ID', sort=False).agg(
+                Producto=('Producto', 'first'), Cantidad=('Cantidad', 'sum')
+            ).reset_index()
+            totales.insert(0, 'Periodo', dia)
+            self._totales_dia[dia] = totales
+        return self._totales_dia[dia]
+
+    def daily_totals(self, inicio=None, fin=None):
+        """
+        Totales diarios por producto (como totals('D')) de los días con
+        inicio <= día < fin; solo se leen las particiones del rango.
+        """
+        self._flush()
+        inicio = None if inicio is None else pd.Timestamp(inicio)
+        fin = None if fin is None else pd.Timestamp(fin)
+        dias = self._days_between(inicio, fin)
+        if not dias:
+            return _empty_totals()
+        return pd.concat([self._daily_totals(dia) for dia in dias], ignore_index=True)
+
+    def totals(self, periodo='D'):
+        """
+        Cantidad total por producto en cada periodo ('D' diario, 'M' mensual), con
+        columnas Periodo, ID, Producto y Cantidad. Se recalcula solo lo que cambió.
+        """
+        if periodo not in PERIODOS:
+            raise ValueError(f"Periodo desconocido: {periodo}")
+        self._flush()
+        if periodo not in self._totales:
+            totales = self.daily_totals()
+            if periodo == 'M' and not totales.empty:
+                totales['Periodo'] = totales['Periodo'].dt.to_period('M').dt.to_timestamp().astype(DTYPE_FECHA)
+                totales = totales.groupby(['Periodo', 'ID'], sort=False).agg(
+                    Producto=('Producto', 'first'), Cantidad=('Cantidad', 'sum')
+                ).reset_index()
+            self._totales[periodo] = totales
+        return self._totales[periodo]
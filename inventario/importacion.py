@@ -0,0 +1,119 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from inventario.cache import load_snapshot, read_table
+from inventario.esquema import inventory_frame
+from inventario.movimientos import TIPOS_MOVIMIENTO, apply_movements, drop_applied_rows, normalize_movements
+from inventario.validacion import select_columns, validate_rows
+
+# Tamaño total de los archivos a partir del cual se leen en un pool de procesos: un
+# Excel se lee a ~0,4 MB/s y arrancar el pool ('spawn') cuesta ~1 s, así que para
+# archivos más pequeños la lectura secuencial es más rápida
+BYTES_MINIMOS_POOL = 1024 * 1024
+
+
+def read_initial_inventory(path):
+    """
+    Lee el archivo de inventario inicial y lo normaliza a las columnas y tipos del
+    inventario (esquema 'inventario' de inventario.validacion). Devuelve
+    (df_inventario, rechazadas), con rechazadas como en validate_rows. Lanza
+    ValueError si falta una columna obligatoria.
+    """
+    df_inicial, error = select_columns(read_table(path), 'inventario')
+    if error:
+        raise ValueError(error)
+    df_inicial, rechazadas = validate_rows(df_inicial, 'inventario')
+
+    df_inventario = inventory_frame(pd.DataFrame({
+        'ID': df_inicial['ID'],
+        'Producto': df_inicial['PRODUCTO'],
+        'Stock': df_inicial['STOCK_INICIAL'],
+        'Categoría': df_inicial['CATEGORIA'],
+        'Presentación': df_inicial['PRESENTACION'],
+        'Ventas': 0,
+        'Compras': 0
+    }).reset_index(drop=True))
+    return df_inventario, rechazadas
+
+
+def parse_movement_file(path):
+    """
+    Lee y normaliza un archivo de movimientos. Se ejecuta en un proceso del pool,
+    así que nunca lanza excepciones: devuelve (df_normalizado, rechazadas, error).
+    """
+    try:
+        return normalize_movements(load_snapshot(path))
+    except Exception as e:
+        return None, [], f"No se pudo leer el archivo. Asegúrese de que el formato (ID, Cantidad) sea correcto. Error: {e}"
+
+
+def import_movement_files(df_inventario, archivos, max_workers=None, applied_keys=None):
+    """
+    Importa varios archivos de movimientos de una vez.
+
+    `archivos` es una lista de (tipo, ruta) con tipo 'venta' o 'compra'. Los archivos
+    se leen en paralelo en un pool de procesos (la lectura de Excel usa CPU) si entre
+    todos ocupan al menos BYTES_MINIMOS_POOL, o uno tras otro si no, y luego
+    todas las cantidades se aplican juntas al inventario, en el orden de `archivos`,
+    con independencia de qué archivo terminó de leerse antes. Se omiten las líneas
+    con CLAVE ya aplicada según `applied_keys` (como en apply_movements) o repetida en
+    un archivo anterior del mismo tipo; los resultados ya las descuentan.
+
+    Devuelve (resultados, df_inventario_nuevo, historiales):
+    - resultados: una tupla (exitosas, fallidas, error) por archivo, como process_sales_from_df.
+    - df_inventario_nuevo: inventario actualizado, o None si no hubo movimientos válidos.
+    - historiales: {tipo: df_hist} con las filas nuevas de cada historial.
+    """
+    rutas = [ruta for _, ruta in archivos]
+    tamano = sum(os.path.getsize(ruta) for ruta in rutas if os.path.exists(ruta))
+    if len(rutas) > 1 and tamano >= BYTES_MINIMOS_POOL:
+        max_workers = max_workers or min(len(rutas), os.cpu_count() or 1)
+        # 'spawn': hacer fork de un servidor con hilos (Streamlit) puede bloquear a los hijos
+        contexto = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=contexto) as pool:
+            leidos = list(pool.map(parse_movement_file, rutas))
+    else:
+        leidos = [parse_movement_file(ruta) for ruta in rutas]
+
+    claves_vistas = {tipo: set() for tipo in TIPOS_MOVIMIENTO}
+
+    def claves_aplicadas(tipo, claves):
+        # Las claves de un archivo anterior del mismo tipo cuentan como ya aplicadas,
+        # así cada línea repetida entre archivos se descuenta del archivo que la repite
+        previas = claves_vistas[tipo].intersection(claves)
+        return previas | (applied_keys(tipo, claves) if applied_keys is not None else set())
+
+    ids_validos = pd.Index(df_inventario['ID'])
+    resultados = []
+    validas_por_tipo = {}
+    for (tipo, _), (df_movimientos, rechazadas, error) in zip(archivos, leidos):
+        if error:
+            resultados.append((0, [], error))
+            continue
+        df_movimientos = drop_applied_rows(df_movimientos, tipo, claves_aplicadas)
+        if 'CLAVE' in df_movimientos.columns:
+            claves_vistas[tipo].update(df_movimientos['CLAVE'].dropna())
+        es_valida = df_movimientos['ID'].isin(ids_validos)
+        fallidas = rechazadas + [f"ID {pid}" for pid in df_movimientos.loc[~es_valida, 'ID'].unique()]
+        resultados.append((int(es_valida.sum()), fallidas, None))
+        validas_por_tipo.setdefault(tipo, []).append(df_movimientos[es_valida])
+
+    df_inventario_nuevo = None
+    historiales = {}
+    for tipo in TIPOS_MOVIMIENTO:
+        if tipo not in validas_por_tipo:
+            continue
+        _, _, _, df_resultado, df_hist = apply_movements(
+            df_inventario if df_inventario_nuevo is None else df_inventario_nuevo,
+            # Las claves ya se filtraron archivo por archivo
+            pd.concat(validas_por_tipo[tipo], ignore_index=True),
+            tipo,
+        )
+        if df_resultado is not None:
+            df_inventario_nuevo = df_resultado
+            historiales[tipo] = df_hist
+
+    return resultados, df_inventario_nuevo, historiales
@@ -0,0 +1,206 @@
+import itertools
+import math
+import re
+from bisect import bisect_left, bisect_right, insort
+
+import numpy as np
+
+# Lo que separa las palabras en la búsqueda de productos
+_NO_ALFANUMERICO = re.compile(r'[^a-z0-9]+')
+# Mayor que cualquier carácter de una palabra normalizada: cierra el rango de un prefijo
+_FIN_PREFIJO = '\U0010ffff'
+# Largo mínimo de una palabra buscada para buscarla en medio de las palabras, y de
+# una abreviatura del catálogo para que coincida con una palabra más larga
+_MIN_INFIJO = 3
+
+
+class SortedColumnIndex:
+    """
+    Valores de una columna del inventario ordenados como pares (valor, posición).
+
+    Se actualiza producto a producto (búsqueda binaria), de modo que consultar los
+    k mayores o contar los productos por debajo de un umbral no requiere ordenar el inventario.
+    """
+
+    def __init__(self, values):
+        self.rebuild(values)
+
+    def rebuild(self, values):
+        """Reconstruye el índice a partir de todos los valores de la columna."""
+        valores = np.asarray(values)
+        orden = np.lexsort((np.arange(len(valores)), valores)) if len(valores) else np.array([], dtype=int)
+        self._claves = list(zip(valores[orden].tolist(), orden.tolist()))
+
+    def add(self, posicion, valor):
+        insort(self._claves, (valor, posicion))
+
+    def update(self, posicion, anterior, nuevo):
+        i = bisect_left(self._claves, (anterior, posicion))
+        if i == len(self._claves) or self._claves[i] != (anterior, posicion):
+            raise KeyError(posicion)
+        del self._claves[i]
+        insort(self._claves, (nuevo, posicion))
+
+    def largest(self, k):
+        """Posiciones de los k valores mayores, de mayor a menor."""
+        return [posicion for _, posicion in reversed(self._claves[-k:])] if k > 0 else []
+
+    def count_at_most(self, umbral):
+        """Cantidad de posiciones con valor <= umbral."""
+        return bisect_right(self._claves, (umbral, math.inf))
+
+
+def search_words(texto):
+    """Palabras de un texto para buscar: sin tildes, en minúsculas y sin signos de puntuación."""
+    return _search_texts([texto])[0].split()
+
+
+def _search_texts(textos):
+    # Textos normalizados para buscar (palabras separadas por un espacio); unidecode
+    # (importación diferida) solo se aplica a los que no son ASCII
+    from unidecode import unidecode
+    return [
+        ' '.join(_NO_ALFANUMERICO.sub(' ', (texto if texto.isascii() else unidecode(texto)).lower()).split())
+        for texto in map(str, textos)
+    ]
+
+
+class ProductSearchIndex:
+    """
+    Índice de búsqueda de productos por ID y nombre, sin distinguir mayúsculas, tildes
+    ni signos de puntuación ('har indu' encuentra 'HAR. INDUPAN'). Las abreviaturas
+    del catálogo también coinciden: 'harina indupan' encuentra 'HAR. INDUPAN'.
+
+    Las palabras del ID y del nombre de cada producto se guardan ordenadas, junto al
+    ID al que pertenecen: cada palabra buscada es un prefijo que se localiza con
+    búsqueda binaria (y sus abreviaturas, palabras exactas), y solo se recorren sus
+    coincidencias hasta completar el límite.
+    Si no hay ninguna, se buscan coincidencias en medio de las palabras ('dupan') con
+    str.find sobre el texto de todo el catálogo, sin recorrer los productos uno a uno.
+    Se actualiza producto a producto con add/remove.
+    """
+
+    def __init__(self, ids=(), nombres=()):
+        self.rebuild(ids, nombres)
+
+    def rebuild(self, ids, nombres):
+        """Reconstruye el índice a partir de todos los IDs y nombres del inventario."""
+        ids = list(ids)
+        textos = _search_texts(
+            f"{product_id} {'' if nombre is None or nombre != nombre else nombre}"
+            for product_id, nombre in zip(ids, nombres)
+        )
+        self._palabras = {}
+        for product_id, texto in zip(ids, textos):
+            # Si un ID está repetido, cuenta solo su primera aparición (como InventoryStore)
+            if product_id not in self._palabras:
+                self._palabras[product_id] = tuple(dict.fromkeys(texto.split()))
+
+        # Palabras ordenadas (_claves) y, en paralelo, el ID de cada una (_ids)
+        claves = [palabra for palabras in self._palabras.values() for palabra in palabras]
+        ids = [product_id for product_id, palabras in self._palabras.items() for _ in palabras]
+        orden = sorted(range(len(claves)), key=claves.__getitem__)
+        self._claves = [claves[i] for i in orden]
+        self._ids = [ids[i] for i in orden]
+
+        # Texto de todo el catálogo para las búsquedas en medio de las palabras: una
+        # línea por producto; _inicios[k] es donde empieza la línea de _ids_texto[k]
+        self._ids_texto = list(self._palabras)
+        self._inicios = []
+        partes = []
+        posicion = 0
+        for palabras in self._palabras.values():
+            linea = ' '.join(palabras) + '\n'
+            self._inicios.append(posicion)
+            partes.append(linea)
+            posicion += len(linea)
+        self._texto = ''.join(partes)
+
+    def __len__(self):
+        return len(self._palabras)
+
+    def add(self, product_id, nombre):
+        if product_id in self._palabras:
+            return
+        texto, = _search_texts([f"{product_id} {'' if nombre is None or nombre != nombre else nombre}"])
+        self._palabras[product_id] = palabras = tuple(dict.fromkeys(texto.split()))
+        for palabra in palabras:
+            i = bisect_right(self._claves, palabra)
+            self._claves.insert(i, palabra)
+            self._ids.insert(i, product_id)
+        self._ids_texto.append(product_id)
+        self._inicios.append(len(self._texto))
+        self._texto += ' '.join(palabras) + '\n'
+
+    def remove(self, product_ids):
+        # Las líneas del texto del catálogo se conservan: search descarta los IDs eliminados
+        for product_id in product_ids:
+            for palabra in self._palabras.pop(product_id, ()):
+                inicio, fin = bisect_left(self._claves, palabra), bisect_right(self._claves, palabra)
+                i = self._ids.index(product_id, inicio, fin)
+                del self._claves[i]
+                del self._ids[i]
+
+    def _ranges(self, buscada):
+        # Palabras que empiezan por `buscada` y palabras que son una abreviatura suya
+        # ('har' para 'harina'), de al menos _MIN_INFIJO letras; los números no se abrevian
+        rangos = [(bisect_left(self._claves, buscada), bisect_left(self._claves, buscada + _FIN_PREFIJO))]
+        for largo in range(_MIN_INFIJO, len(buscada) if buscada.isalpha() else 0):
+            abreviatura = buscada[:largo]
+            inicio = bisect_left(self._claves, abreviatura)
+            fin = bisect_right(self._claves, abreviatura, inicio)
+            if fin > inicio:
+                rangos.append((inicio, fin))
+        return rangos
+
+    def search(self, texto, limite=20):
+        """
+        IDs de hasta `limite` productos que coinciden con `texto`: primero el ID exacto,
+        luego los productos con palabras que empiezan por cada palabra buscada (en
+        orden alfabético de la palabra más selectiva) o, si no hay ninguno, los que las
+        contienen.
+        Con el texto vacío devuelve los primeros productos del inventario.
+        """
+        buscadas = list(dict.fromkeys(search_words(texto)))
+        if not buscadas:
+            return list(itertools.islice(self._palabras, limite))
+
+        resultado = dict.fromkeys(pid for pid in (str(texto).upper().strip(),) if pid in self._palabras)
+
+        # La palabra con menos coincidencias guía el recorrido; el resto solo filtra
+        rangos = {palabra: self._ranges(palabra) for palabra in buscadas}
+        guia = min(rangos, key=lambda palabra: sum(fin - inicio for inicio, fin in rangos[palabra]))
+        resto = [palabra for palabra in buscadas if palabra != guia]
+        for inicio, fin in rangos[guia]:
+            for i in range(inicio, fin):
+                if len(resultado) >= limite:
+                    return list(resultado)
+                product_id = self._ids[i]
+                if product_id not in resultado and self._matches(product_id, resto, _prefix_or_abbreviation):
+                    resultado[product_id] = None
+
+        # Sin coincidencias por prefijo, se buscan en medio de las palabras: se recorren en
+        # el texto del catálogo las apariciones de la palabra buscada menos frecuente
+        if not resultado and all(len(palabra) >= _MIN_INFIJO for palabra in buscadas):
+            guia = min(buscadas, key=self._texto.count) if len(buscadas) > 1 else buscadas[0]
+            posicion = self._texto.find(guia)
+            while posicion != -1 and len(resultado) < limite:
+                k = bisect_right(self._inicios, posicion) - 1
+                product_id = self._ids_texto[k]
+                if (product_id not in resultado and product_id in self._palabras
+                        and self._matches(product_id, buscadas, str.__contains__)):
+                    resultado[product_id] = None
+                # Siguiente línea: cada producto se evalúa una sola vez
+                siguiente = self._inicios[k + 1] if k + 1 < len(self._inicios) else len(self._texto)
+                posicion = self._texto.find(guia, siguiente)
+        return list(resultado)
+
+    def _matches(self, product_id, buscadas, coincide):
+        palabras = self._palabras[product_id]
+        return all(any(coincide(p, buscada) for p in palabras) for buscada in buscadas)
+
+
+def _prefix_or_abbreviation(palabra, buscada):
+    return palabra.startswith(buscada) or (
+        len(palabra) >= _MIN_INFIJO and buscada.isalpha() and buscada.startswith(palabra)
+    )
@@ -0,0 +1,68 @@
+import os
+
+import pandas as pd
+
+from inventario.validacion import resolve_columns
+
+# Memoria máxima aproximada que puede ocupar un bloque en proceso (bytes)
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# Cuántas veces ocupa un bloque durante su procesamiento respecto a su tamaño leído
+# (normalización, historial y copias intermedias)
+_FACTOR_PROCESO = 4
+_FILAS_MUESTRA = 1000
+
+
+def _movement_columns(path):
+    """
+    Localiza, leyendo solo la cabecera, las columnas ID, CANTIDAD y las opcionales FECHA y CLAVE
+    (con los alias del esquema 'movimientos'). Devuelve ({posición: nombre}, error).
+    """
+    return resolve_columns(pd.read_csv(path, nrows=0).columns, 'movimientos')
+
+
+def chunk_rows(path, posiciones, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """Calcula cuántas filas caben en un bloque según lo que ocupa una muestra del archivo."""
+    muestra = pd.read_csv(path, usecols=list(posiciones), nrows=_FILAS_MUESTRA)
+    if muestra.empty:
+        return _FILAS_MUESTRA
+    bytes_por_fila = muestra.memory_usage(index=False, deep=True).sum() / len(muestra)
+    return max(1, int(memory_limit // (bytes_por_fila * _FACTOR_PROCESO)))
+
+
+def stream_movements(path, process_chunk, progress=None, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """
+    Procesa un archivo CSV de movimientos por bloques de tamaño acotado.
+
+    Cada bloque (ID, CANTIDAD y FECHA/CLAVE si existen) se entrega a `process_chunk`, que devuelve
+    (exitosas, fallidas, error) como process_sales_from_df. `progress`, si se indica,
+    recibe la fracción del archivo ya leída (0 a 1) tras cada bloque.
+    Devuelve el total (exitosas, fallidas, error) del archivo.
+    """
+    posiciones, error = _movement_columns(path)
+    if error:
+        return 0, [], error
+
+    filas_por_bloque = chunk_rows(path, posiciones, memory_limit)
+    tamano = os.path.getsize(path) or 1
+
+    exitosas = 0
+    fallidas = {}
+    with open(path, 'rb') as f:
+        lector = pd.read_csv(f, usecols=list(posiciones), chunksize=filas_por_bloque)
+        for bloque in lector:
+            # usecols conserva el orden del archivo: se renombra según la posición
+            bloque.columns = [posiciones[p] for p in sorted(posiciones)]
+
+            bloque_exitosas, bloque_fallidas, error = process_chunk(bloque[list(posiciones.values())])
+            if error:
+                return exitosas, list(fallidas), error
+            exitosas += bloque_exitosas
+            fallidas.update(dict.fromkeys(bloque_fallidas))
+
+            if progress is not None:
+                progress(min(f.tell() / tamano, 1.0))
+
+    if progress is not None:
+        progress(1.0)
+    return exitosas, list(fallidas), None
@@ -0,0 +1,168 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+# Límites superiores (ms) de los intervalos de los histogramas de latencia; el último es infinito
+LIMITES_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float('inf')]
+
+# Variable de entorno que activa la instrumentación al arrancar
+VARIABLE_ENTORNO = 'INVENTARIO_METRICAS'
+
+_habilitado = os.environ.get(VARIABLE_ENTORNO, '') not in ('', '0')
+_lock = threading.Lock()
+# nombre de la sección -> [cantidad, total_s, máximo_s, conteos por intervalo]
+_secciones = {}
+_contadores = {}
+_desde = time.time()
+
+
+def enable(activo=True):
+    """Activa o desactiva la instrumentación para todo el proceso."""
+    global _habilitado
+    _habilitado = bool(activo)
+
+
+def is_enabled():
+    return _habilitado
+
+
+def reset():
+    """Borra todas las mediciones."""
+    global _desde
+    with _lock:
+        _secciones.clear()
+        _contadores.clear()
+        _desde = time.time()
+
+
+def record(nombre, segundos):
+    """Registra una duración (en segundos) de la sección `nombre`."""
+    if not _habilitado or segundos is None:
+        return
+    intervalo = bisect.bisect_left(LIMITES_MS, segundos * 1000)
+    with _lock:
+        seccion = _secciones.get(nombre)
+        if seccion is None:
+            seccion = _secciones[nombre] = [0, 0.0, 0.0, [0] * len(LIMITES_MS)]
+        seccion[0] += 1
+        seccion[1] += segundos
+        seccion[2] = max(seccion[2], segundos)
+        seccion[3][intervalo] += 1
+
+
+def count(nombre, cantidad=1):
+    """Incrementa el contador `nombre` (por ejemplo, las re-ejecuciones de la app)."""
+    if not _habilitado:
+        return
+    with _lock:
+        _contadores[nombre] = _contadores.get(nombre, 0) + cantidad
+
+
+def clock():
+    """Instante actual para medir a mano con record(nombre, clock() - inicio); None si está desactivada."""
+    return time.perf_counter() if _habilitado else None
+
+
+def elapsed(inicio):
+    """Segundos desde `inicio` (de clock()), o None si la medición no empezó."""
+    return None if inicio is None else time.perf_counter() - inicio
+
+
+class _Section:
+    __slots__ = ('nombre', 'inicio')
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.nombre, time.perf_counter() - self.inicio)
+        return False
+
+
+class _NullSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULA = _NullSection()
+
+
+def section(nombre):
+    """
+    Context manager que mide el bloque como la sección `nombre`. Desactivada, devuelve
+    siempre el mismo objeto vacío: no mide ni reserva memoria.
+    """
+    return _Section(nombre) if _habilitado else _NULA
+
+
+def timed(nombre):
+    """Decorador que mide cada llamada a la función como la sección `nombre`."""
+    def decorador(func):
+        @functools.wraps(func)
+        def envoltura(*args, **kwargs):
+            if not _habilitado:
+                return func(*args, **kwargs)
+            with _Section(nombre):
+                return func(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def _percentile_ms(conteos, total, maximo, fraccion):
+    # Límite superior del intervalo donde cae el percentil (aproximado por el histograma);
+    # en el último intervalo, sin límite, se usa el máximo observado
+    acumulado = 0
+    for limite, conteo in zip(LIMITES_MS[:-1], conteos):
+        acumulado += conteo
+        if acumulado >= fraccion * total:
+            return min(limite, round(maximo * 1000, 2))
+    return round(maximo * 1000, 2)
+
+
+def _label(i):
+    if i == len(LIMITES_MS) - 1:
+        return f">{LIMITES_MS[-2]:g}ms"
+    return f"<={LIMITES_MS[i]:g}ms"
+
+
+def snapshot():
+    """Copia de todas las mediciones: contadores y, por sección, resumen e histograma."""
+    with _lock:
+        secciones = {nombre: (n, total, maximo, list(conteos)) for nombre, (n, total, maximo, conteos) in _secciones.items()}
+        contadores = dict(_contadores)
+        desde = _desde
+    return {
+        'habilitado': _habilitado,
+        'desde': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(desde)),
+        'contadores': contadores,
+        'secciones': [
+            {
+                'seccion': nombre,
+                'llamadas': n,
+                'total_ms': round(total * 1000, 1),
+                'media_ms': round(total * 1000 / n, 2),
+                'max_ms': round(maximo * 1000, 2),
+                'p50_ms': _percentile_ms(conteos, n, maximo, 0.5),
+                'p95_ms': _percentile_ms(conteos, n, maximo, 0.95),
+                'histograma': {_label(i): conteo for i, conteo in enumerate(conteos) if conteo},
+            }
+            for nombre, (n, total, maximo, conteos) in sorted(secciones.items())
+        ],
+    }
+
+
+def to_json():
+    """snapshot() como texto JSON."""
+    return json.dumps(snapshot(), indent=2, ensure_ascii=False, default=str)
@@ -0,0 +1,143 @@
+import pandas as pd
+
+from inventario.esquema import movement_dates
+from inventario.validacion import format_row_error, select_columns, validate_rows
+
+# Columna del inventario que acumula cada tipo de movimiento y signo que se aplica al Stock
+TIPOS_MOVIMIENTO = {
+    'venta': ('Ventas', -1),
+    'compra': ('Compras', 1),
+}
+
+
+def normalize_movements(df_movimientos):
+    """
+    Normaliza un DataFrame de movimientos a las columnas ID y CANTIDAD, más FECHA y
+    CLAVE (identificador único de la línea) si el archivo las trae, según el esquema
+    'movimientos' de inventario.validacion (con sus alias de cabecera).
+    Devuelve (df_normalizado, rechazadas, error): las filas con ID vacío, cantidad que
+    no sea un entero mayor que cero o fecha inválida se excluyen y se describen en
+    rechazadas; error indica que falta una columna obligatoria.
+    """
+    df_movimientos, error = select_columns(df_movimientos, 'movimientos')
+    if error:
+        return None, [], error
+    df_movimientos, rechazadas = validate_rows(df_movimientos, 'movimientos')
+    return df_movimientos, rechazadas, None
+
+
+def drop_applied_rows(df_movimientos, tipo, applied_keys):
+    """
+    Descarta las líneas con CLAVE ya aplicada (según applied_keys(tipo, claves), que
+    devuelve el conjunto de las ya registradas) o repetida dentro del mismo lote.
+    Las líneas sin clave se conservan siempre.
+    """
+    if 'CLAVE' not in df_movimientos.columns:
+        return df_movimientos
+    claves = df_movimientos['CLAVE']
+    repetida = claves.notna() & claves.duplicated()
+    nuevas = claves[claves.notna() & ~repetida]
+    ya_aplicada = claves.isin(applied_keys(tipo, nuevas.tolist())) if len(nuevas) else False
+    return df_movimientos[~(repetida | ya_aplicada)]
+
+
+def apply_movements(df_inventario, df_movimientos, tipo, applied_keys=None):
+    """
+    Aplica un lote de movimientos ('venta' o 'compra') al inventario en una sola pasada.
+
+    Las cantidades se agregan por ID con un groupby y se cruzan con el inventario
+    por ID, en lugar de buscar el producto línea por línea. Si se indica
+    `applied_keys`, se omiten las líneas con CLAVE ya aplicada (drop_applied_rows).
+    Devuelve (exitosas, fallidas, error, df_inventario_nuevo, df_hist_nuevo): fallidas
+    describe las filas rechazadas por datos inválidos y los IDs que no existen en el
+    inventario ("ID X"); si hay claves, df_hist_nuevo incluye además la columna 'Clave'.
+    Si no hay líneas válidas, df_inventario_nuevo y df_hist_nuevo son None.
+    """
+    columna_acumulada, signo = TIPOS_MOVIMIENTO[tipo]
+
+    df_movimientos, rechazadas, error = normalize_movements(df_movimientos)
+    if error:
+        return 0, [], error, None, None
+    if applied_keys is not None:
+        df_movimientos = drop_applied_rows(df_movimientos, tipo, applied_keys)
+
+    df_validas, fallidas, primera_aparicion, productos = _match_inventory(df_inventario, df_movimientos, rechazadas)
+    if df_validas.empty:
+        return 0, fallidas, None, None, None
+
+    # 2. Totales por ID y cruce indexado con el inventario
+    delta = _deltas(df_inventario, df_validas, primera_aparicion)
+
+    df_inventario_nuevo = df_inventario.copy()
+    df_inventario_nuevo['Stock'] = df_inventario_nuevo['Stock'] + signo * delta
+    df_inventario_nuevo[columna_acumulada] = df_inventario_nuevo[columna_acumulada] + delta
+
+    return len(df_validas), fallidas, None, df_inventario_nuevo, _history_lines(df_validas, productos)
+
+
+def apply_transfers(df_origen, df_destino, df_movimientos):
+    """
+    Aplica un lote de traslados (columnas ID y Cantidad, como los archivos de
+    movimientos) del inventario de una sucursal al de otra: el Stock baja en el
+    origen y sube en el destino, sin tocar Ventas ni Compras. Ambos inventarios deben
+    tener el mismo catálogo en el mismo orden (inventario.sucursales).
+    Como en un traslado individual, no se traslada más stock del que hay en el origen:
+    en el orden del archivo, las líneas de un producto a partir de la que lo supera se
+    rechazan y se describen en fallidas.
+    Devuelve (exitosas, fallidas, error, df_origen_nuevo, df_destino_nuevo, df_hist_nuevo),
+    con el mismo significado que en apply_movements.
+    """
+    df_movimientos, rechazadas, error = normalize_movements(df_movimientos)
+    if error:
+        return 0, [], error, None, None, None
+
+    df_validas, fallidas, primera_aparicion, productos = _match_inventory(df_origen, df_movimientos, rechazadas)
+
+    disponible = df_origen.loc[primera_aparicion].set_index('ID')['Stock'].clip(lower=0)
+    excede = df_validas.groupby('ID', sort=False)['CANTIDAD'].cumsum() > df_validas['ID'].map(disponible)
+    if excede.any():
+        fallidas = fallidas + [format_row_error(
+            'CANTIDAD', "supera el stock de la sucursal de origen", df_validas.loc[excede, 'CANTIDAD']
+        )]
+        df_validas = df_validas[~excede]
+    if df_validas.empty:
+        return 0, fallidas, None, None, None, None
+
+    delta = _deltas(df_origen, df_validas, primera_aparicion)
+    df_origen_nuevo = df_origen.copy()
+    df_origen_nuevo['Stock'] = df_origen_nuevo['Stock'] - delta
+    df_destino_nuevo = df_destino.copy()
+    df_destino_nuevo['Stock'] = df_destino_nuevo['Stock'] + delta.to_numpy()
+
+    return len(df_validas), fallidas, None, df_origen_nuevo, df_destino_nuevo, _history_lines(df_validas, productos)
+
+
+def _match_inventory(df_inventario, df_movimientos, rechazadas):
+    # 1. Filtro de ID Válidas (Asegura coherencia). Si un ID está repetido en el
+    # inventario, solo se actualiza su primera aparición.
+    primera_aparicion = ~df_inventario['ID'].duplicated()
+    productos = df_inventario.loc[primera_aparicion].set_index('ID')['Producto']
+
+    es_valida = df_movimientos['ID'].isin(productos.index)
+    fallidas = rechazadas + [f"ID {pid}" for pid in df_movimientos.loc[~es_valida, 'ID'].unique()]
+    return df_movimientos[es_valida], fallidas, primera_aparicion, productos
+
+
+def _deltas(df_inventario, df_validas, primera_aparicion):
+    totales = df_validas.groupby('ID', sort=False)['CANTIDAD'].sum()
+    return df_inventario['ID'].map(totales).where(primera_aparicion).fillna(0).astype(int)
+
+
+def _history_lines(df_validas, productos):
+    # 3. Historial: una fila por línea válida, construido de una sola vez. Las líneas
+    # sin fecha en el archivo se fechan en el momento de la carga.
+    fechas = df_validas['FECHA'] if 'FECHA' in df_validas.columns else pd.Series(pd.NaT, index=df_validas.index)
+    df_hist_nuevo = pd.DataFrame({
+        'ID': pd.Series(df_validas['ID'].to_numpy(), dtype=object),
+        'Producto': pd.Series(df_validas['ID'].map(productos).to_numpy(), dtype=object),
+        'Cantidad': df_validas['CANTIDAD'].to_numpy(),
+        'Fecha': movement_dates(fechas).to_numpy(),
+    })
+    if 'CLAVE' in df_validas.columns:
+        df_hist_nuevo['Clave'] = pd.Series(df_validas['CLAVE'].to_numpy(), dtype=object)
+    return df_hist_nuevo
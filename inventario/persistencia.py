@@ -0,0 +1,532 @@
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+
+from inventario.esquema import COLUMNAS_INVENTARIO, SUCURSAL_PRINCIPAL, history_frame, normalize_id, normalize_ids
+from inventario.movimientos import TIPOS_MOVIMIENTO
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    orden INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    producto TEXT,
+    stock INTEGER NOT NULL DEFAULT 0,
+    categoria TEXT,
+    presentacion TEXT,
+    ventas INTEGER NOT NULL DEFAULT 0,
+    compras INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_productos_id ON productos (id, orden);
+CREATE TABLE IF NOT EXISTS movimientos (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    tipo TEXT NOT NULL,
+    id TEXT NOT NULL,
+    producto TEXT,
+    cantidad INTEGER NOT NULL,
+    creado TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_movimientos_tipo ON movimientos (tipo, seq);
+CREATE TABLE IF NOT EXISTS archivos (
+    huella TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    nombre TEXT,
+    cargado TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (huella, tipo)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT
+);
+CREATE TABLE IF NOT EXISTS sucursales (
+    nombre TEXT PRIMARY KEY,
+    creada TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS existencias (
+    orden INTEGER NOT NULL REFERENCES productos (orden) ON DELETE CASCADE,
+    sucursal TEXT NOT NULL REFERENCES sucursales (nombre),
+    stock INTEGER NOT NULL DEFAULT 0,
+    ventas INTEGER NOT NULL DEFAULT 0,
+    compras INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (orden, sucursal)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_existencias_sucursal ON existencias (sucursal, orden);
+"""
+
+# Orden de las columnas de la tabla 'productos' equivalente a COLUMNAS_INVENTARIO.
+# 'id' no es clave única porque el archivo inicial puede traer IDs repetidos: como
+# en InventoryStore, los movimientos se aplican a la primera aparición del ID.
+_COLUMNAS_SQL = ['id', 'producto', 'stock', 'categoria', 'presentacion', 'ventas', 'compras']
+
+# Movimiento que pasa stock de una sucursal a otra (no cambia el stock total)
+TIPO_TRASLADO = 'traslado'
+
+# Máximo de parámetros por consulta 'IN (...)' (SQLite admite 999 en versiones antiguas)
+_PARAMETROS_POR_CONSULTA = 500
+
+
+class Ledger:
+    """
+    Registro persistente del inventario en SQLite (modo WAL).
+
+    Guarda un libro de movimientos de solo inserción y el stock materializado: por
+    sucursal en 'existencias' y, sumado para todas las sucursales, en 'productos'
+    (ambos se actualizan en la misma transacción). Cada escritura es una única
+    transacción, y cada una incrementa la versión que usan las sesiones para saber si
+    su copia en memoria quedó desactualizada; cada movimiento guarda la versión en que
+    se escribió, para que una sesión pueda ponerse al día leyendo solo los nuevos
+    (load_changes). Se comparte entre sesiones: cada hilo reutiliza su propia conexión.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        # Evita que dos sesiones hagan a la vez la carga inicial desde Excel
+        self.bootstrap_lock = threading.Lock()
+        self._conn().executescript(ESQUEMA)
+        # Identificador de esta base de datos: distingue versiones de bases distintas
+        self._conn().execute("INSERT OR IGNORE INTO meta (clave, valor) VALUES ('instancia', ?)", (uuid.uuid4().hex,))
+        self.instance_id = self._conn().execute("SELECT valor FROM meta WHERE clave = 'instancia'").fetchone()[0]
+        self._migrate()
+
+    def _migrate(self):
+        """Actualiza bases creadas por versiones anteriores del esquema."""
+        conn = self._conn()
+        columnas = {fila[1] for fila in conn.execute("PRAGMA table_info(movimientos)")}
+        if 'clave' not in columnas:
+            conn.execute("ALTER TABLE movimientos ADD COLUMN clave TEXT")
+        # Clave opcional de cada línea: un mismo movimiento no puede aplicarse dos veces
+        conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_movimientos_clave ON movimientos (tipo, clave) "
+            "WHERE clave IS NOT NULL"
+        )
+        # Sucursal de cada movimiento (origen, en los traslados) y destino de los traslados
+        with self._transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO sucursales (nombre) VALUES (?)", (SUCURSAL_PRINCIPAL,))
+            if 'sucursal' not in columnas:
+                conn.execute("ALTER TABLE movimientos ADD COLUMN sucursal TEXT")
+                conn.execute("ALTER TABLE movimientos ADD COLUMN destino TEXT")
+                conn.execute("UPDATE movimientos SET sucursal = ?", (SUCURSAL_PRINCIPAL,))
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_movimientos_sucursal ON movimientos (tipo, sucursal, seq)")
+            # Versión del registro en que se escribió cada movimiento (load_changes)
+            if 'version' not in columnas:
+                conn.execute("ALTER TABLE movimientos ADD COLUMN version INTEGER")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_movimientos_version ON movimientos (version)")
+            # Bases anteriores a las sucursales: todo su stock pasa a la sucursal principal
+            if conn.execute("SELECT 1 FROM existencias LIMIT 1").fetchone() is None:
+                conn.execute(
+                    "INSERT INTO existencias (orden, sucursal, stock, ventas, compras) "
+                    "SELECT orden, ?, stock, ventas, compras FROM productos",
+                    (SUCURSAL_PRINCIPAL,),
+                )
+            # IDs guardados sin normalizar (con espacios o minúsculas) por versiones anteriores:
+            # se normalizan una sola vez, como los busca InventoryStore
+            if conn.execute("SELECT 1 FROM meta WHERE clave = 'ids_normalizados'").fetchone() is None:
+                conn.create_function('normalizar_id', 1, normalize_id, deterministic=True)
+                for tabla in ('productos', 'movimientos'):
+                    conn.execute(f"UPDATE {tabla} SET id = normalizar_id(id) WHERE id != normalizar_id(id)")
+                conn.execute("INSERT INTO meta (clave, valor) VALUES ('ids_normalizados', '1')")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Al eliminar un producto se eliminan sus existencias en todas las sucursales
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Transacción de escritura: bloquea a otros escritores hasta el COMMIT."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _bump_version(conn, catalogo=False):
+        # `catalogo`: la escritura cambia el catálogo o las sucursales, no solo cantidades
+        conn.execute(
+            "INSERT INTO meta (clave, valor) VALUES ('version', 1) "
+            "ON CONFLICT(clave) DO UPDATE SET valor = valor + 1"
+        )
+        version = int(conn.execute("SELECT valor FROM meta WHERE clave = 'version'").fetchone()[0])
+        if catalogo:
+            conn.execute("INSERT OR REPLACE INTO meta (clave, valor) VALUES ('version_catalogo', ?)", (version,))
+        return version
+
+    # --- Lectura ---
+
+    def version(self, clave='version'):
+        """
+        Número que aumenta con cada escritura confirmada. Con clave='version_catalogo',
+        la versión de la última escritura que cambió el catálogo o las sucursales.
+        """
+        row = self._conn().execute("SELECT valor FROM meta WHERE clave = ?", (clave,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def get_flag(self, clave):
+        row = self._conn().execute("SELECT valor FROM meta WHERE clave = ?", (clave,)).fetchone()
+        return row is not None and row[0] == '1'
+
+    def set_flag(self, clave):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (clave, valor) VALUES (?, '1')", (clave,))
+
+    def file_applied(self, huella, tipo):
+        """Indica si ya se aplicó un archivo de movimientos con esta huella (file_fingerprint)."""
+        return self._conn().execute(
+            "SELECT 1 FROM archivos WHERE huella = ? AND tipo = ?", (huella, tipo)
+        ).fetchone() is not None
+
+    def applied_keys(self, tipo, claves):
+        """Subconjunto de `claves` (claves de línea) ya registradas para este tipo de movimiento."""
+        return self._keys_in("SELECT clave FROM movimientos WHERE tipo = ? AND clave IN ({})", (tipo,), claves)
+
+    def staged_keys(self, claves):
+        """Subconjunto de `claves` ya guardadas en el área temporal (staging) de este hilo."""
+        return self._keys_in("SELECT clave FROM temp.lote_movimientos WHERE clave IN ({})", (), claves)
+
+    def _keys_in(self, consulta, parametros, claves):
+        claves = list(claves)
+        encontradas = set()
+        for inicio in range(0, len(claves), _PARAMETROS_POR_CONSULTA):
+            lote = claves[inicio:inicio + _PARAMETROS_POR_CONSULTA]
+            encontradas.update(fila[0] for fila in self._conn().execute(
+                consulta.format(', '.join('?' * len(lote))), (*parametros, *lote)
+            ))
+        return encontradas
+
+    def locations(self):
+        """Nombres de las sucursales, en el orden en que se crearon."""
+        return [fila[0] for fila in self._conn().execute("SELECT nombre FROM sucursales ORDER BY rowid")]
+
+    def has_inventory(self):
+        return self._conn().execute("SELECT 1 FROM productos LIMIT 1").fetchone() is not None
+
+    def load_inventory(self):
+        """Devuelve (versión, DataFrame del inventario) leídos en un mismo instante."""
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            version = self.version()
+            df = pd.read_sql_query(
+                f"SELECT {', '.join(_COLUMNAS_SQL)} FROM productos ORDER BY orden", conn
+            )
+        finally:
+            conn.execute("COMMIT")
+        df.columns = COLUMNAS_INVENTARIO
+        return version, df
+
+    def load_inventory_by_location(self):
+        """
+        Devuelve (versión, DataFrame del inventario total, {sucursal: DataFrame}) leídos en
+        un mismo instante. El inventario de cada sucursal tiene todo el catálogo, en el
+        mismo orden que el total, con el Stock, Ventas y Compras de esa sucursal.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            version = self.version()
+            df = pd.read_sql_query(
+                f"SELECT orden, {', '.join(_COLUMNAS_SQL)} FROM productos ORDER BY orden", conn
+            )
+            sucursales = self.locations()
+            existencias = pd.read_sql_query("SELECT sucursal, orden, stock, ventas, compras FROM existencias", conn)
+        finally:
+            conn.execute("COMMIT")
+        ordenes = df.pop('orden')
+        df.columns = COLUMNAS_INVENTARIO
+
+        por_sucursal = {}
+        grupos = dict(tuple(existencias.groupby('sucursal', sort=False)))
+        for nombre in sucursales:
+            # Sin fila en 'existencias': el producto nunca tuvo movimientos en la sucursal
+            cantidades = (
+                grupos.get(nombre, existencias.iloc[:0])
+                .set_index('orden')[['stock', 'ventas', 'compras']]
+                .reindex(ordenes, fill_value=0)
+            )
+            por_sucursal[nombre] = df.assign(
+                Stock=cantidades['stock'].to_numpy(),
+                Ventas=cantidades['ventas'].to_numpy(),
+                Compras=cantidades['compras'].to_numpy(),
+            )
+        return version, df, por_sucursal
+
+    def load_changes(self, version, limite):
+        """
+        Movimientos escritos después de `version`, para ponerse al día sin recargar el
+        inventario: devuelve (versión actual, DataFrame con tipo, ID, Producto, Cantidad,
+        Fecha, Sucursal y Destino, en orden de registro). El DataFrame es None si desde
+        entonces cambió el catálogo o hay más de `limite` movimientos: en ese caso
+        conviene recargar todo.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            actual = self.version()
+            if self.version('version_catalogo') > version:
+                return actual, None
+            df = pd.read_sql_query(
+                "SELECT tipo, id AS ID, producto AS Producto, cantidad AS Cantidad, creado AS Fecha, "
+                "sucursal AS Sucursal, destino AS Destino FROM movimientos WHERE version > ? ORDER BY seq LIMIT ?",
+                conn,
+                params=(version, limite + 1),
+            )
+        finally:
+            conn.execute("COMMIT")
+        return actual, (df if len(df) <= limite else None)
+
+    def load_history(self, tipo, sucursal=None):
+        """
+        Historial (ID, Producto, Cantidad, Fecha) de un tipo de movimiento, en orden de
+        registro, de una sucursal o (None) de todas.
+        """
+        filtro, parametros = ("AND sucursal = ? ", (tipo, sucursal)) if sucursal is not None else ("", (tipo,))
+        return history_frame(pd.read_sql_query(
+            "SELECT id AS ID, producto AS Producto, cantidad AS Cantidad, creado AS Fecha "
+            f"FROM movimientos WHERE tipo = ? {filtro}ORDER BY seq",
+            self._conn(),
+            params=parametros,
+        ))
+
+    def last_movement(self, tipo):
+        """Número de registro (seq) del último movimiento de un tipo, o 0 si no hay ninguno."""
+        return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM movimientos WHERE tipo = ?", (tipo,)).fetchone()[0]
+
+    def load_transfers(self):
+        """Traslados entre sucursales (ID, Producto, Cantidad, Origen, Destino, Fecha), en orden de registro."""
+        df = pd.read_sql_query(
+            "SELECT id AS ID, producto AS Producto, cantidad AS Cantidad, sucursal AS Origen, "
+            "destino AS Destino, creado AS Fecha FROM movimientos WHERE tipo = ? ORDER BY seq",
+            self._conn(),
+            params=(TIPO_TRASLADO,),
+        )
+        df['Fecha'] = pd.to_datetime(df['Fecha'])
+        return df
+
+    # --- Escritura ---
+
+    def add_location(self, nombre):
+        """Crea una sucursal sin stock. Devuelve (versión previa, versión nueva)."""
+        with self._transaction() as conn:
+            anterior = self.version()
+            conn.execute("INSERT INTO sucursales (nombre) VALUES (?)", (nombre,))
+            return anterior, self._bump_version(conn, catalogo=True)
+
+    def add_products(self, df_productos, sucursal=SUCURSAL_PRINCIPAL):
+        """
+        Inserta productos nuevos (columnas del inventario); su stock inicial queda en
+        `sucursal`. Devuelve (versión previa, versión nueva).
+        """
+        with self._transaction() as conn:
+            anterior = self.version()
+            self._insert_products(conn, df_productos, sucursal)
+            return anterior, self._bump_version(conn, catalogo=True)
+
+    def apply_catalog_changes(self, df_altas, df_cambios, product_ids_bajas, sucursal=SUCURSAL_PRINCIPAL):
+        """
+        Aplica en una sola transacción las altas (columnas del inventario, con su stock
+        inicial en `sucursal`), los cambios (ID, Producto, Categoría, Presentación; None
+        conserva el valor actual) y las bajas de un lote del catálogo (inventario.catalogo).
+        Los cambios se aplican a todas las filas del ID. Devuelve (versión previa, versión nueva).
+        """
+        cambios = df_cambios.astype(object).where(df_cambios.notna(), None)
+        with self._transaction() as conn:
+            anterior = self.version()
+            conn.executemany("DELETE FROM productos WHERE id = ?", ((normalize_id(pid),) for pid in product_ids_bajas))
+            conn.executemany(
+                "UPDATE productos SET producto = COALESCE(?, producto), categoria = COALESCE(?, categoria), "
+                "presentacion = COALESCE(?, presentacion) WHERE id = ?",
+                ((producto, categoria, presentacion, normalize_id(pid)) for pid, producto, categoria, presentacion
+                 in cambios[['ID', 'Producto', 'Categoría', 'Presentación']].itertuples(index=False, name=None)),
+            )
+            self._insert_products(conn, df_altas, sucursal)
+            return anterior, self._bump_version(conn, catalogo=True)
+
+    def record_movements(self, tipo, df_hist, sucursal=SUCURSAL_PRINCIPAL):
+        """
+        Registra un lote de movimientos (ID, Producto, Cantidad, Fecha) de una sucursal y
+        actualiza el stock materializado en una sola transacción. Devuelve (versión
+        previa, versión nueva).
+        """
+        return self.record_movement_batches({tipo: df_hist}, sucursal=sucursal)
+
+    def record_movement_batches(self, lotes, archivos=(), sucursal=SUCURSAL_PRINCIPAL):
+        """
+        Como record_movements, para varios lotes {tipo: df_hist} en una misma
+        transacción. `archivos` son los (huella, tipo, nombre) de los archivos de
+        origen, que quedan marcados como aplicados en esa misma transacción.
+        """
+        with self._transaction() as conn:
+            anterior = self.version()
+            for tipo, df_hist in lotes.items():
+                self._insert_movements(conn, tipo, df_hist, sucursal, anterior + 1)
+            self._insert_files(conn, archivos)
+            return anterior, self._bump_version(conn)
+
+    def record_transfers(self, origen, destino, df_hist):
+        """
+        Registra un lote de traslados (ID, Producto, Cantidad, Fecha) de la sucursal
+        `origen` a `destino` en una sola transacción: el stock baja en una y sube en la
+        otra, y el total de 'productos' no cambia. Devuelve (versión previa, versión nueva).
+        """
+        if origen == destino:
+            raise ValueError("La sucursal de origen y la de destino deben ser distintas.")
+        df_hist = df_hist.assign(ID=normalize_ids(df_hist['ID']).to_numpy())
+        totales = df_hist.groupby('ID', sort=False)['Cantidad'].sum()
+        fechas = df_hist['Fecha'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        with self._transaction() as conn:
+            anterior = self.version()
+            conn.executemany(
+                "INSERT INTO movimientos (tipo, id, producto, cantidad, creado, sucursal, destino, version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((TIPO_TRASLADO, pid, producto, int(cantidad), creado, origen, destino, anterior + 1)
+                 for pid, producto, cantidad, creado in zip(df_hist['ID'], df_hist['Producto'], df_hist['Cantidad'], fechas)),
+            )
+            for sucursal, signo in ((origen, -1), (destino, 1)):
+                self._add_location_stock(conn, sucursal, 'stock', ((signo * int(cantidad), 0, pid) for pid, cantidad in totales.items()))
+            return anterior, self._bump_version(conn)
+
+    @contextmanager
+    def staging(self):
+        """
+        Área temporal (una tabla TEMP de la conexión de este hilo) donde se guardan por
+        bloques los movimientos de un archivo (stage_movements) hasta aplicarlos con
+        record_file_movements. Así la memoria no crece con el tamaño del archivo y los
+        demás escritores no esperan mientras se lee. Se descarta al salir.
+        """
+        conn = self._conn()
+        conn.execute("DROP TABLE IF EXISTS temp.lote_movimientos")
+        conn.execute(
+            "CREATE TEMP TABLE lote_movimientos "
+            "(id TEXT NOT NULL, producto TEXT, cantidad INTEGER NOT NULL, creado TEXT NOT NULL, clave TEXT)"
+        )
+        conn.execute("CREATE INDEX temp.idx_lote_clave ON lote_movimientos (clave) WHERE clave IS NOT NULL")
+        try:
+            yield
+        finally:
+            conn.execute("DROP TABLE IF EXISTS temp.lote_movimientos")
+
+    def stage_movements(self, df_hist):
+        """Guarda un bloque de movimientos (ID, Producto, Cantidad, Fecha y Clave opcional) en el área temporal."""
+        conn = self._conn()
+        # La tabla temporal no bloquea la base de datos: otros hilos siguen escribiendo
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT INTO temp.lote_movimientos (id, producto, cantidad, creado, clave) VALUES (?, ?, ?, ?, ?)",
+                self._movement_rows(df_hist),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def record_file_movements(self, huella, tipo, nombre, sucursal=SUCURSAL_PRINCIPAL):
+        """
+        Aplica en `sucursal` los movimientos de un archivo guardados en el área temporal
+        (staging) y lo marca como aplicado, en una sola transacción y solo si su huella
+        no estaba registrada ya (se comprueba dentro de la transacción). Devuelve
+        (versión previa, versión nueva), o None si el archivo ya estaba aplicado.
+        """
+        with self._transaction() as conn:
+            if self.file_applied(huella, tipo):
+                return None
+            anterior = self.version()
+            conn.execute(
+                "INSERT INTO movimientos (tipo, id, producto, cantidad, creado, clave, sucursal, version) "
+                "SELECT ?, id, producto, cantidad, creado, clave, ?, ? FROM temp.lote_movimientos ORDER BY rowid",
+                (tipo, sucursal, anterior + 1),
+            )
+            totales = conn.execute(
+                "SELECT id, SUM(cantidad) FROM temp.lote_movimientos GROUP BY id ORDER BY MIN(rowid)"
+            ).fetchall()
+            self._apply_totals(conn, tipo, totales, sucursal)
+            self._insert_files(conn, [(huella, tipo, nombre)])
+            return anterior, self._bump_version(conn)
+
+    def record_files(self, archivos):
+        """Marca como aplicados archivos (huella, tipo, nombre) que no dejaron movimientos."""
+        with self._transaction() as conn:
+            self._insert_files(conn, archivos)
+
+    @staticmethod
+    def _insert_products(conn, df_productos, sucursal):
+        df_productos = df_productos[COLUMNAS_INVENTARIO].assign(ID=normalize_ids(df_productos['ID']).to_numpy())
+        filas = df_productos.itertuples(index=False, name=None)
+        siguiente_orden = conn.execute("SELECT COALESCE(MAX(orden), -1) + 1 FROM productos").fetchone()[0]
+        conn.executemany(
+            f"INSERT INTO productos ({', '.join(_COLUMNAS_SQL)}, orden) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ((*fila, siguiente_orden + i) for i, fila in enumerate(filas)),
+        )
+        conn.execute(
+            "INSERT INTO existencias (orden, sucursal, stock, ventas, compras) "
+            "SELECT orden, ?, stock, ventas, compras FROM productos WHERE orden >= ?",
+            (sucursal, siguiente_orden),
+        )
+
+    @staticmethod
+    def _add_location_stock(conn, sucursal, columna, cantidades):
+        # Suma (stock, cantidad en `columna`, ID) a las existencias de la sucursal; la fila
+        # se crea con el primer movimiento del producto en la sucursal
+        conn.executemany(
+            f"INSERT INTO existencias (orden, sucursal, stock, {columna}) "
+            "SELECT MIN(orden), ?, ?, ? FROM productos WHERE id = ? GROUP BY id "
+            f"ON CONFLICT (orden, sucursal) DO UPDATE SET stock = stock + excluded.stock, "
+            f"{columna} = {columna} + excluded.{columna}",
+            ((sucursal, stock, cantidad, pid) for stock, cantidad, pid in cantidades),
+        )
+
+    @staticmethod
+    def _insert_files(conn, archivos):
+        conn.executemany("INSERT OR IGNORE INTO archivos (huella, tipo, nombre) VALUES (?, ?, ?)", archivos)
+
+    @classmethod
+    def _insert_movements(cls, conn, tipo, df_hist, sucursal, version):
+        conn.executemany(
+            "INSERT INTO movimientos (tipo, id, producto, cantidad, creado, clave, sucursal, version) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ((tipo, *fila, sucursal, version) for fila in cls._movement_rows(df_hist)),
+        )
+        totales = df_hist.groupby(normalize_ids(df_hist['ID']).to_numpy(), sort=False)['Cantidad'].sum()
+        cls._apply_totals(conn, tipo, totales.items(), sucursal)
+
+    @staticmethod
+    def _movement_rows(df_hist):
+        # Filas (ID normalizado, Producto, Cantidad, Fecha como texto, Clave o None) de un lote
+        fechas = df_hist['Fecha'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        if 'Clave' in df_hist.columns:
+            claves = [clave if isinstance(clave, str) else None for clave in df_hist['Clave']]
+        else:
+            claves = [None] * len(df_hist)
+        return (
+            (pid, producto, int(cantidad), creado, clave)
+            for pid, producto, cantidad, creado, clave
+            in zip(normalize_ids(df_hist['ID']), df_hist['Producto'], df_hist['Cantidad'], fechas, claves)
+        )
+
+    @classmethod
+    def _apply_totals(cls, conn, tipo, totales, sucursal):
+        # Suma al stock materializado (total y de la sucursal) los totales (ID, cantidad) de un lote
+        columna_acumulada, signo = TIPOS_MOVIMIENTO[tipo]
+        totales = [(pid, int(cantidad)) for pid, cantidad in totales]
+        conn.executemany(
+            f"UPDATE productos SET stock = stock + ?, {columna_acumulada.lower()} = {columna_acumulada.lower()} + ? "
+            "WHERE orden = (SELECT MIN(orden) FROM productos WHERE id = ?)",
+            ((signo * cantidad, cantidad, pid) for pid, cantidad in totales),
+        )
+        cls._add_location_stock(
+            conn, sucursal, columna_acumulada.lower(),
+            ((signo * cantidad, cantidad, pid) for pid, cantidad in totales),
+        )
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+# Suavizado exponencial de la demanda diaria (equivale a una media de ~14 días)
+ALFA = 2 / (14 + 1)
+# Días recientes usados para medir la variabilidad de la demanda y la frecuencia de compra
+VENTANA_DIAS = 28
+# Días que tarda en llegar un pedido al proveedor
+PLAZO_ENTREGA_DIAS = 7
+# Factor de seguridad para un nivel de servicio del 95%
+Z_SERVICIO = 1.65
+# Días de historial de ventas de un producto a partir de los cuales se confía en su
+# EWMA. Con menos (por ejemplo, un mes de ventas sin fecha, fechado el día de la carga,
+# parece un solo día) el producto se reordena por un umbral fijo de stock
+DIAS_MINIMOS = 14
+UMBRAL_BAJO_STOCK = 10
+
+_UN_DIA = pd.Timedelta(days=1)
+
+
+def _per_id(totales, columna='Cantidad'):
+    return totales.groupby('ID', sort=False)[columna].sum()
+
+
+class DemandForecast:
+    """
+    Demanda diaria y punto de reorden de todos los productos a partir de los
+    historiales de ventas y compras, calculados con operaciones vectorizadas sobre
+    los totales diarios (HistoryBuffer.daily_totals), sin recorrer producto por producto.
+
+    La demanda es una media exponencial (EWMA) de las ventas diarias, corregida
+    según los días transcurridos desde la primera venta de cada producto (si no, un
+    producto con pocos días de historial parecería vender menos). La parte de los
+    días ya cerrados se guarda y solo se actualiza con los días nuevos; el día en
+    curso se suma en cada consulta. Si el historial cambia en un día ya cerrado (por
+    ejemplo, una carga con fechas anteriores) se recalcula desde el principio.
+
+    Los productos con menos de `dias_minimos` días desde su primera venta, o sin
+    ventas, se reordenan con Stock <= `umbral` hasta tener historial suficiente.
+    """
+
+    def __init__(self, alfa=ALFA, ventana=VENTANA_DIAS, z=Z_SERVICIO, dias_minimos=DIAS_MINIMOS, umbral=UMBRAL_BAJO_STOCK):
+        self.alfa = alfa
+        self.ventana = ventana
+        self.z = z
+        self.dias_minimos = dias_minimos
+        self.umbral = umbral
+        self._fuente = None
+        self._revision = None
+        self._hasta = None
+        self._ewma = pd.Series(dtype=float)
+        self._primera_venta = pd.Series(dtype='datetime64[ns]')
+        self._ventana_clave = None
+        self._ventana = None
+
+    def _sealed_ewma(self, ventas, hoy):
+        """EWMA al cierre del día anterior a `hoy`, reutilizando el estado ya calculado."""
+        if self._fuente is not ventas or (
+            self._hasta is not None and (ventas.first_change_since(self._revision) or hoy) < self._hasta
+        ):
+            self._ewma = pd.Series(dtype=float)
+            self._primera_venta = pd.Series(dtype='datetime64[ns]')
+            self._hasta = None
+        self._fuente = ventas
+        self._revision = ventas.revision
+
+        if self._hasta is None or hoy > self._hasta:
+            nuevos = ventas.daily_totals(self._hasta, hoy)
+            if self._hasta is not None:
+                self._ewma = self._ewma * (1 - self.alfa) ** ((hoy - self._hasta).days)
+            if not nuevos.empty:
+                # Peso de cada día: alfa * (1 - alfa)^(días hasta el cierre de ayer)
+                antiguedad = ((hoy - _UN_DIA - nuevos['Periodo']) / _UN_DIA).to_numpy()
+                aporte = _per_id(nuevos.assign(
+                    Cantidad=self.alfa * (1 - self.alfa) ** antiguedad * nuevos['Cantidad'].to_numpy()
+                ))
+                self._ewma = self._ewma.add(aporte, fill_value=0.0)
+                self._primera_venta = self._primera_venta.combine_first(
+                    nuevos.groupby('ID', sort=False)['Periodo'].min()
+                )
+            self._hasta = hoy
+        return self._ewma
+
+    def demand_rate(self, ventas, hoy=None):
+        """Demanda diaria estimada por ID (EWMA de las ventas diarias, incluido el día en curso)."""
+        hoy = pd.Timestamp.today().normalize() if hoy is None else pd.Timestamp(hoy).normalize()
+        return self._demand(ventas, hoy)[0]
+
+    def _demand(self, ventas, hoy):
+        # (demanda diaria, días observados desde la primera venta) por ID
+        hoy_totales = _per_id(ventas.daily_totals(hoy, hoy + _UN_DIA)).astype(float)
+        ewma = (self._sealed_ewma(ventas, hoy) * (1 - self.alfa)).add(self.alfa * hoy_totales, fill_value=0.0)
+        # Corrección del arranque en cero: divide por el peso acumulado de los días observados
+        dias = (hoy - self._primera_venta.reindex(ewma.index).fillna(hoy)) / _UN_DIA + 1
+        return ewma / (1 - (1 - self.alfa) ** dias.to_numpy()), dias
+
+    def _window_stats(self, ventas, compras, hoy):
+        """Desviación de la demanda diaria y días con compras por ID en la ventana reciente."""
+        clave = (id(ventas), ventas.revision, id(compras), compras.revision, hoy)
+        if self._ventana_clave != clave:
+            inicio = hoy - (self.ventana - 1) * _UN_DIA
+            recientes = ventas.daily_totals(inicio, hoy + _UN_DIA)
+            cantidades = recientes['Cantidad'].astype(float)
+            suma = _per_id(recientes.assign(Cantidad=cantidades))
+            suma_cuadrados = _per_id(recientes.assign(Cantidad=cantidades ** 2))
+            # Los días sin ventas cuentan como demanda cero
+            media = suma / self.ventana
+            desviacion = np.sqrt((suma_cuadrados / self.ventana - media ** 2).clip(lower=0))
+            dias_compra = compras.daily_totals(inicio, hoy + _UN_DIA)['ID'].value_counts()
+            self._ventana_clave = clave
+            self._ventana = (desviacion, dias_compra)
+        return self._ventana
+
+    def reorder_table(self, df_inventario, ventas, compras, plazo=PLAZO_ENTREGA_DIAS, hoy=None):
+        """
+        Añade al inventario, por producto: demanda diaria, días de cobertura
+        (Stock / demanda), punto de reorden (demanda del plazo de entrega más stock de
+        seguridad) y pedido sugerido (para cubrir también el intervalo habitual entre
+        compras). 'Reordenar' indica Stock <= punto de reorden. Sin historial
+        suficiente, la demanda y la cobertura quedan vacías y el punto de reorden es
+        el umbral fijo.
+        """
+        hoy = pd.Timestamp.today().normalize() if hoy is None else pd.Timestamp(hoy).normalize()
+        desviacion, dias_compra = self._window_stats(ventas, compras, hoy)
+        tasa, dias = self._demand(ventas, hoy)
+
+        ids = df_inventario['ID']
+        stock = df_inventario['Stock'].astype(float)
+        fiable = ids.map(dias).fillna(0).astype(float) >= self.dias_minimos
+        demanda = ids.map(tasa).fillna(0.0).astype(float).where(fiable, 0.0)
+        seguridad = self.z * ids.map(desviacion).fillna(0.0).astype(float).where(fiable, 0.0) * np.sqrt(plazo)
+        punto_reorden = np.ceil(demanda * plazo + seguridad).where(fiable, float(self.umbral))
+        # Intervalo entre compras: ventana / días con compras (el plazo si no hubo compras)
+        intervalo = (self.ventana / ids.map(dias_compra)).fillna(plazo).astype(float)
+        sugerido = np.ceil(punto_reorden + demanda * intervalo - stock).clip(lower=0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cobertura = np.where(demanda > 0, stock / demanda, np.inf)
+        cobertura = np.where(stock <= 0, 0.0, np.where(fiable, cobertura, np.nan))
+
+        return df_inventario.assign(**{
+            'Demanda diaria': demanda.where(fiable).round(2),
+            'Días de cobertura': np.round(cobertura, 1),
+            'Punto de reorden': punto_reorden.astype('int64'),
+            'Pedido sugerido': sugerido.astype('int64'),
+            'Reordenar': stock <= punto_reorden,
+        })
+
+    def reorder_list(self, df_inventario, ventas, compras, plazo=PLAZO_ENTREGA_DIAS, hoy=None):
+        """Productos a reordenar, de menos a más días de cobertura (después, los que no la tienen, por stock)."""
+        tabla = self.reorder_table(df_inventario, ventas, compras, plazo, hoy)
+        return tabla[tabla['Reordenar']].drop(columns='Reordenar').sort_values(['Días de cobertura', 'Stock'], kind='stable')
@@ -0,0 +1,93 @@
+import glob
+import importlib.util
+import os
+import threading
+
+from inventario import metricas
+
+# Carpeta donde se guardan los reportes ya generados (uno por reporte, versión y formato)
+REPORTES_DIR = os.path.join('.cache', 'reportes')
+
+# formato -> (etiqueta, tipo MIME, módulo opcional que lo requiere)
+FORMATOS = {
+    'xlsx': ("Excel (.xlsx)", 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsxwriter'),
+    'csv': ("CSV (.csv)", 'text/csv', None),
+    'parquet': ("Parquet (.parquet)", 'application/vnd.apache.parquet', 'pyarrow'),
+}
+
+# Filas que se convierten a la vez al escribir (la memoria no depende del tamaño del reporte)
+_FILAS_POR_BLOQUE = 10_000
+
+# Un candado por ruta de reporte: solo esperan las descargas del mismo reporte y versión
+_lock = threading.Lock()
+_locks_por_ruta = {}
+
+
+def available_formats():
+    """Formatos cuyo módulo opcional está instalado."""
+    return [
+        formato for formato, (_, _, modulo) in FORMATOS.items()
+        if modulo is None or importlib.util.find_spec(modulo) is not None
+    ]
+
+
+def write_excel(df, path, sheet_name='Reporte'):
+    """
+    Escribe un .xlsx con xlsxwriter en modo 'constant_memory': cada fila se vuelca al
+    disco al terminarla, así que solo se mantiene en memoria un bloque de filas.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd hh:mm:ss'})
+    worksheet = workbook.add_worksheet(sheet_name)
+    worksheet.write_row(0, 0, [str(col) for col in df.columns])
+    fila = 1
+    for inicio in range(0, len(df), _FILAS_POR_BLOQUE):
+        bloque = df.iloc[inicio:inicio + _FILAS_POR_BLOQUE].astype(object)
+        # Las celdas vacías (NaN) se dejan en blanco
+        bloque = bloque.where(bloque.notna(), None)
+        for valores in bloque.itertuples(index=False, name=None):
+            worksheet.write_row(fila, 0, valores)
+            fila += 1
+    workbook.close()
+
+
+def write_report(df, formato, path):
+    """Escribe df en `path` en el formato indicado ('xlsx', 'csv' o 'parquet')."""
+    if formato == 'xlsx':
+        write_excel(df, path)
+    elif formato == 'csv':
+        df.to_csv(path, index=False, chunksize=_FILAS_POR_BLOQUE)
+    elif formato == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Formato de reporte desconocido: {formato}")
+
+
+def cached_report(nombre, version, df, formato, reportes_dir=REPORTES_DIR):
+    """
+    Devuelve la ruta del reporte `nombre` para esta `version` de los datos, generándolo
+    solo si no existe. Al generarlo se borran las versiones anteriores del mismo reporte.
+    """
+    path = os.path.join(reportes_dir, f"{nombre}-{version}.{formato}")
+    with _lock:
+        lock = _locks_por_ruta.setdefault(path, threading.Lock())
+    with lock:
+        if not os.path.exists(path):
+            os.makedirs(reportes_dir, exist_ok=True)
+            for anterior in glob.glob(os.path.join(reportes_dir, f"{nombre}-*.{formato}")):
+                if anterior != path:
+                    with _lock:
+                        _locks_por_ruta.pop(anterior, None)
+                    try:
+                        os.remove(anterior)
+                    except FileNotFoundError:
+                        # Otra descarga ya lo borró
+                        pass
+            # Se escribe en un temporal y se renombra: nunca se sirve un reporte a medias
+            temporal = f"{path}.{os.getpid()}.tmp"
+            with metricas.section(f"reporte.{formato}"):
+                write_report(df, formato, temporal)
+            os.replace(temporal, path)
+    return path
+
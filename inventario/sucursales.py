@@ -0,0 +1,123 @@
+import pandas as pd
+
+from inventario.almacen import InventoryStore
+from inventario.movimientos import apply_movements
+
+# Columnas con las cantidades de cada sucursal (el resto del inventario es el catálogo común)
+COLUMNAS_CANTIDAD = ['Stock', 'Ventas', 'Compras']
+
+
+class LocationInventory:
+    """
+    Inventario repartido por sucursales.
+
+    Cada sucursal tiene su InventoryStore con el catálogo completo, en el mismo orden
+    que `total`, y sus propias cantidades (Stock, Ventas y Compras). `total` es otro
+    InventoryStore con la suma de todas las sucursales. Cada movimiento se aplica a la
+    vez en la sucursal y en el total, así que los KPIs, índices y figuras de "todas las
+    sucursales" salen de agregados ya mantenidos, sin sumar ni concatenar los
+    inventarios de las sucursales al mostrarlos.
+    """
+
+    def __init__(self, df_total, por_sucursal):
+        self.total = InventoryStore(df_total)
+        self.sucursales = {nombre: InventoryStore(df) for nombre, df in por_sucursal.items()}
+
+    def names(self):
+        """Nombres de las sucursales, en el orden en que se crearon."""
+        return list(self.sucursales)
+
+    def store(self, sucursal=None):
+        """InventoryStore de una sucursal, o el total si sucursal es None."""
+        return self.total if sucursal is None else self.sucursales[sucursal]
+
+    def summary(self):
+        """Por sucursal: unidades en stock y productos con stock (de los KPIs e índices ya mantenidos)."""
+        return pd.DataFrame([
+            {
+                'Sucursal': nombre,
+                'Unidades en Stock': store.aggregates.total_stock,
+                'Productos con Stock': len(store) - store.indices['Stock'].count_at_most(0),
+            }
+            for nombre, store in self.sucursales.items()
+        ])
+
+    def add_location(self, nombre):
+        """Añade una sucursal sin stock, con el catálogo actual."""
+        self.sucursales[nombre] = InventoryStore(self.total.df.assign(Stock=0, Ventas=0, Compras=0))
+
+    def adjust(self, sucursal, product_id, stock=0, ventas=0, compras=0):
+        """Como InventoryStore.adjust en la sucursal y en el total; devuelve el nuevo stock de la sucursal."""
+        self.total.adjust(product_id, stock=stock, ventas=ventas, compras=compras)
+        return self.sucursales[sucursal].adjust(product_id, stock=stock, ventas=ventas, compras=compras)
+
+    def transfer(self, origen, destino, product_id, cantidad):
+        """Pasa `cantidad` unidades de stock de una sucursal a otra (el total no cambia)."""
+        self.sucursales[origen].adjust(product_id, stock=-cantidad)
+        self.sucursales[destino].adjust(product_id, stock=cantidad)
+
+    def replace_location(self, sucursal, df_sucursal):
+        """
+        Sustituye el inventario de una sucursal tras un procesamiento masivo; el total
+        recibe solo la diferencia de cantidades, en una operación vectorizada.
+        """
+        anterior = self.sucursales[sucursal].df
+        df_total = self.total.df.copy()
+        for columna in COLUMNAS_CANTIDAD:
+            df_total[columna] = df_total[columna] + (df_sucursal[columna].to_numpy() - anterior[columna].to_numpy())
+        self.sucursales[sucursal].replace(df_sucursal)
+        self.total.replace(df_total)
+
+    def replace_transfer(self, origen, df_origen, destino, df_destino):
+        """Sustituye los inventarios de origen y destino tras un lote de traslados (el total no cambia)."""
+        self.sucursales[origen].replace(df_origen)
+        self.sucursales[destino].replace(df_destino)
+
+    def add(self, product, sucursal):
+        """Añade un producto a todas las sucursales; su stock inicial queda en `sucursal`."""
+        self.total.add(product)
+        for nombre, store in self.sucursales.items():
+            store.add(product if nombre == sucursal else {**product, 'Stock': 0, 'Ventas': 0, 'Compras': 0})
+
+    def apply_changes(self, altas, cambios, bajas, sucursal):
+        """Aplica un lote del catálogo (InventoryStore.apply_changes) en todas las sucursales y el total."""
+        self.total.apply_changes(altas, cambios, bajas)
+        sin_stock = altas.assign(Stock=0, Ventas=0, Compras=0)
+        for nombre, store in self.sucursales.items():
+            store.apply_changes(altas if nombre == sucursal else sin_stock, cambios, bajas)
+
+
+def process_location_movements(ledger, sucursales, df_movimientos, tipo, sucursal, historiales=(), sincronizar=None):
+    """
+    Procesa un lote de movimientos ('venta' o 'compra') de una sucursal: lo valida y
+    agrega con apply_movements contra el inventario de la sucursal, omitiendo las
+    líneas con CLAVE ya registrada, lo guarda en el registro (Ledger) en una sola
+    transacción y actualiza `sucursales` (LocationInventory.replace_location) y los
+    `historiales` (HistoryBuffer) indicados.
+    `sincronizar(versión previa, versión nueva, aplicar)` decide cómo reflejar la
+    escritura en memoria (la sesión de Streamlit usa sync_session); por defecto se
+    aplica directamente. Devuelve (exitosas, fallidas, error).
+    """
+    inventario = sucursales.store(sucursal)
+    if inventario.empty:
+        return 0, [], "El inventario base está vacío."
+
+    exitosas, fallidas, error, df_inventario_nuevo, df_hist_new = apply_movements(
+        inventario.df, df_movimientos, tipo, applied_keys=ledger.applied_keys
+    )
+    if error:
+        return 0, [], error
+
+    if df_inventario_nuevo is not None:
+        def aplicar():
+            sucursales.replace_location(sucursal, df_inventario_nuevo)
+            for historial in historiales:
+                historial.extend(df_hist_new)
+
+        anterior, nueva = ledger.record_movements(tipo, df_hist_new, sucursal)
+        if sincronizar is None:
+            aplicar()
+        else:
+            sincronizar(anterior, nueva, aplicar)
+
+    return exitosas, fallidas, None
@@ -0,0 +1,46 @@
+import math
+
+TAMANOS_PAGINA = [25, 50, 100, 250]
+
+
+def query_table(df, texto='', categoria=None, orden=None, ascendente=True):
+    """
+    Filtra por texto (en ID o Producto, sin distinguir mayúsculas) y por categoría,
+    y ordena por la columna `orden`. Todo ocurre en el servidor.
+    """
+    mascara = None
+    texto = texto.strip()
+    if texto:
+        mascara = (
+            df['ID'].astype(str).str.contains(texto, case=False, regex=False)
+            | df['Producto'].astype(str).str.contains(texto, case=False, regex=False)
+        )
+    if categoria:
+        por_categoria = df['Categoría'] == categoria
+        mascara = por_categoria if mascara is None else mascara & por_categoria
+
+    resultado = df if mascara is None else df[mascara]
+    if orden:
+        resultado = resultado.sort_values(by=orden, ascending=ascendente, kind='stable')
+    return resultado
+
+
+def cached_query(cache, version, df, **filtros):
+    """
+    query_table reutilizando el último resultado guardado en `cache` (un dict de la
+    sesión) mientras no cambien los datos (`version`) ni los filtros; así cambiar de
+    página no vuelve a filtrar ni a ordenar.
+    """
+    clave = (version, tuple(sorted(filtros.items())))
+    if cache.get('clave') != clave:
+        cache['clave'] = clave
+        cache['resultado'] = query_table(df, **filtros)
+    return cache['resultado']
+
+
+def page_of(df, pagina, tamano):
+    """Devuelve (filas de la página, número total de páginas); la página se ajusta al rango válido."""
+    total_paginas = max(1, math.ceil(len(df) / tamano))
+    pagina = min(max(1, pagina), total_paginas)
+    inicio = (pagina - 1) * tamano
+    return df.iloc[inicio:inicio + tamano], total_paginas
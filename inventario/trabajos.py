@@ -0,0 +1,106 @@
+import os
+import threading
+
+from inventario import metricas
+from inventario.cache import file_fingerprint, read_table
+from inventario.esquema import SUCURSAL_PRINCIPAL
+from inventario.ingesta import DEFAULT_MEMORY_LIMIT, stream_movements
+from inventario.movimientos import apply_movements
+
+# Estados de un trabajo de importación
+PENDIENTE, EN_CURSO, TERMINADO, OMITIDO, FALLIDO = 'pendiente', 'en curso', 'terminado', 'omitido', 'fallido'
+
+
+class MovementImportJob:
+    """
+    Importa un archivo de movimientos de una sucursal en un hilo de fondo.
+
+    El hilo lee el archivo (los CSV por bloques, informando el avance), valida cada
+    bloque contra una copia del inventario con apply_movements y lo guarda en el área
+    temporal del registro (Ledger.staging), de modo que solo hay un bloque en memoria.
+    Al final aplica todos los movimientos con una sola transacción: o se aplica el
+    archivo completo o nada. Las ventas y compras que otras sesiones registren
+    mientras tanto no se pierden, porque el registro suma cantidades al stock en
+    lugar de reemplazarlo. El hilo nunca toca la sesión de Streamlit: las sesiones
+    ven el cambio por la versión del registro.
+    """
+
+    def __init__(self, ledger, tipo, path, nombre=None, borrar_al_terminar=False,
+                 memory_limit=DEFAULT_MEMORY_LIMIT, sucursal=SUCURSAL_PRINCIPAL):
+        self.ledger = ledger
+        self.tipo = tipo
+        self.sucursal = sucursal
+        self.path = path
+        self.nombre = nombre or os.path.basename(path)
+        self.borrar_al_terminar = borrar_al_terminar
+        self.memory_limit = memory_limit
+        self.estado = PENDIENTE
+        self.progreso = 0.0
+        self.resultado = None
+        self._hilo = threading.Thread(target=self._run, name=f"importacion-{self.nombre}", daemon=True)
+
+    def start(self):
+        self._hilo.start()
+        return self
+
+    @property
+    def done(self):
+        return self.estado in (TERMINADO, OMITIDO, FALLIDO)
+
+    def join(self, timeout=None):
+        self._hilo.join(timeout)
+
+    def _run(self):
+        self.estado = EN_CURSO
+        try:
+            self.resultado = self._import()
+            if self.estado == EN_CURSO:
+                self.estado = FALLIDO if self.resultado[2] else TERMINADO
+        except Exception as e:
+            self.resultado = (0, [], f"No se pudo procesar el archivo. Error: {e}")
+            self.estado = FALLIDO
+        finally:
+            self.progreso = 1.0
+            if self.borrar_al_terminar and os.path.exists(self.path):
+                os.remove(self.path)
+
+    @metricas.timed('proceso.importacion_en_segundo_plano')
+    def _import(self):
+        huella = file_fingerprint(self.path)
+        if self.ledger.file_applied(huella, self.tipo):
+            self.estado = OMITIDO
+            return 0, [], None
+
+        _, df_inventario = self.ledger.load_inventory()
+        if df_inventario.empty:
+            return 0, [], "El inventario base está vacío."
+
+        def applied_keys(tipo, claves):
+            # También las claves de bloques anteriores, ya guardadas en el área temporal
+            return self.ledger.applied_keys(tipo, claves) | self.ledger.staged_keys(claves)
+
+        def procesar(bloque):
+            exitosas, fallidas, error, _, df_hist = apply_movements(df_inventario, bloque, self.tipo, applied_keys)
+            if df_hist is not None:
+                self.ledger.stage_movements(df_hist)
+            return exitosas, fallidas, error
+
+        with self.ledger.staging():
+            if self.path.endswith('.csv'):
+                exitosas, fallidas, error = stream_movements(
+                    self.path, procesar, progress=self._set_progress, memory_limit=self.memory_limit
+                )
+            else:
+                exitosas, fallidas, error = procesar(read_table(self.path))
+            if error:
+                return 0, fallidas, error
+
+            if self.ledger.record_file_movements(huella, self.tipo, self.nombre, self.sucursal) is None:
+                # Otra sesión aplicó el mismo archivo mientras este se leía
+                self.estado = OMITIDO
+                return 0, [], None
+        return exitosas, fallidas, None
+
+    def _set_progress(self, fraccion):
+        # Se reserva el último tramo para la escritura en el registro
+        self.progreso = 0.95 * fraccion
@@ -0,0 +1,217 @@
+import functools
+
+import numpy as np
+import pandas as pd
+
+from inventario.esquema import DTYPE_CANTIDAD, intern_ids
+
+# Esquemas de los archivos que se cargan: columna normalizada -> definición.
+#   alias: cabeceras aceptadas, ya normalizadas con clean_col_name (la primera es el nombre oficial)
+#   prefijos: además, cualquier cabecera que empiece así (CANTIDAD_VENDIDA, CANT._VENDIDA...)
+#   contiene: si nada de lo anterior coincide, cualquier cabecera que contenga el texto
+#             (VENTA_CANTIDAD, TOTAL_CANTIDAD...)
+#   obligatoria: si falta la columna, se rechaza el archivo completo
+#   tipo: cómo se validan y convierten los valores (ver _CONVERSORES)
+#   defecto: valor de las celdas vacías; sin él, una celda vacía es un error de la fila
+#   truncar: los decimales de una columna entera se descartan en lugar de rechazar la fila
+#            (el stock inicial de productos a granel puede venir en fracciones de libra)
+_ID = {'alias': ('ID', 'CODIGO', 'SKU', 'ID_PRODUCTO'), 'obligatoria': True, 'tipo': 'id'}
+_ALIAS_PRODUCTO = ('PRODUCTO', 'NOMBRE', 'DESCRIPCION')
+_ALIAS_STOCK = ('STOCK_INICIAL', 'STOCK', 'EXISTENCIA', 'EXISTENCIAS', 'INVENTARIO_INICIAL')
+_ALIAS_CATEGORIA = ('CATEGORIA', 'RUBRO')
+_ALIAS_PRESENTACION = ('PRESENTACION', 'UNIDAD', 'UNIDAD_DE_MEDIDA')
+
+ESQUEMAS = {
+    'movimientos': {
+        'ID': _ID,
+        'CANTIDAD': {'alias': ('CANTIDAD', 'CANT', 'UNIDADES'), 'prefijos': ('CANTIDAD_', 'CANT._', 'CANT_'),
+                     'contiene': ('CANTIDAD',), 'obligatoria': True, 'tipo': 'entero_positivo'},
+        'FECHA': {'alias': ('FECHA', 'FECHA_MOVIMIENTO', 'DIA'), 'tipo': 'fecha'},
+        'CLAVE': {'alias': ('CLAVE', 'ID_LINEA', 'FOLIO', 'REFERENCIA'), 'tipo': 'clave'},
+    },
+    'inventario': {
+        'ID': _ID,
+        'PRODUCTO': {'alias': _ALIAS_PRODUCTO, 'obligatoria': True, 'tipo': 'texto'},
+        'STOCK_INICIAL': {'alias': _ALIAS_STOCK, 'obligatoria': True, 'tipo': 'entero', 'defecto': 0, 'truncar': True},
+        'CATEGORIA': {'alias': _ALIAS_CATEGORIA, 'obligatoria': True, 'tipo': 'texto', 'defecto': None},
+        'PRESENTACION': {'alias': _ALIAS_PRESENTACION, 'obligatoria': True, 'tipo': 'texto', 'defecto': None},
+    },
+    # Altas, cambios y bajas del catálogo (inventario.catalogo): solo el ID es obligatorio;
+    # en los productos existentes, una celda vacía deja el valor actual
+    'catalogo': {
+        'ID': _ID,
+        'PRODUCTO': {'alias': _ALIAS_PRODUCTO, 'tipo': 'texto', 'defecto': None},
+        'STOCK_INICIAL': {'alias': _ALIAS_STOCK, 'tipo': 'entero', 'defecto': 0, 'truncar': True},
+        'CATEGORIA': {'alias': _ALIAS_CATEGORIA, 'tipo': 'texto', 'defecto': None},
+        'PRESENTACION': {'alias': _ALIAS_PRESENTACION, 'tipo': 'texto', 'defecto': None},
+        'ELIMINAR': {'alias': ('ELIMINAR', 'BAJA', 'BORRAR'), 'tipo': 'bandera', 'defecto': False},
+    },
+}
+
+# Valores aceptados en las columnas de tipo 'bandera' (normalizados con clean_col_name)
+VALORES_SI = {'SI', 'S', 'X', '1', 'TRUE', 'VERDADERO', 'YES'}
+VALORES_NO = {'NO', 'N', '0', 'FALSE', 'FALSO'}
+
+# Filas que se citan en cada mensaje de error; el resto solo se cuenta
+MAX_FILAS_POR_ERROR = 10
+# Número de fila en la hoja de la primera fila de datos (la 1 es la cabecera)
+_PRIMERA_FILA = 2
+
+
+@functools.lru_cache(maxsize=4096)
+def clean_col_name(col):
+    """Limpia el nombre de la columna: elimina tildes, espacios, y convierte a mayúsculas."""
+    # Importación diferida: solo se necesita al leer archivos de movimientos
+    from unidecode import unidecode
+    return unidecode(str(col)).strip().replace(' ', '_').upper()
+
+
+def resolve_columns(columnas, esquema):
+    """
+    Localiza las columnas del esquema `esquema` (clave de ESQUEMAS) entre las cabeceras
+    `columnas` de un archivo. Devuelve ({posición: nombre normalizado}, error); error
+    indica la primera columna obligatoria que falta.
+    """
+    return _resolve_columns(tuple(columnas), esquema)
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_columns(columnas, esquema):
+    # Los archivos de un mismo origen repiten la cabecera: se resuelve una sola vez
+    normalizadas = [clean_col_name(col) for col in columnas]
+    posiciones = {}
+    for nombre, definicion in ESQUEMAS[esquema].items():
+        posicion = next((normalizadas.index(alias) for alias in definicion['alias'] if alias in normalizadas), None)
+        if posicion is None:
+            prefijos = definicion.get('prefijos', ())
+            posicion = next((i for i, col in enumerate(normalizadas) if col.startswith(prefijos)), None) if prefijos else None
+        if posicion is None:
+            contiene = definicion.get('contiene', ())
+            posicion = next((i for i, col in enumerate(normalizadas) if any(texto in col for texto in contiene)), None)
+        if posicion is not None and posicion not in posiciones:
+            posiciones[posicion] = nombre
+        elif definicion.get('obligatoria'):
+            aceptados = ', '.join(f"'{alias}'" for alias in definicion['alias'])
+            return None, f"Columna '{nombre}' faltante en el archivo. Nombres aceptados: {aceptados}."
+    return posiciones, None
+
+
+def select_columns(df, esquema):
+    """
+    Devuelve (df_esquema, error): las columnas del esquema presentes en df, renombradas
+    a su nombre normalizado y en el orden del esquema. Conserva el índice de df.
+    """
+    posiciones, error = resolve_columns(df.columns, esquema)
+    if error:
+        return None, error
+    df_esquema = df.iloc[:, list(posiciones)].copy()
+    df_esquema.columns = list(posiciones.values())
+    return df_esquema, None
+
+
+def validate_rows(df, esquema):
+    """
+    Valida y convierte en una sola pasada (vectorizada por columna) las columnas de df,
+    ya normalizadas con select_columns, según su tipo en el esquema.
+
+    Devuelve (df_valido, rechazadas): df_valido tiene solo las filas sin errores, con
+    los valores convertidos; rechazadas es una lista de mensajes, uno por columna y
+    motivo, con las filas de la hoja afectadas (la cabecera es la fila 1).
+    """
+    definiciones = ESQUEMAS[esquema]
+    df = df.copy()
+    invalida = pd.Series(False, index=df.index)
+    rechazadas = []
+    for nombre in df.columns:
+        definicion = definiciones[nombre]
+        valores = df[nombre]
+        vacia = _blank(valores)
+        convertidos, erronea, motivo = _CONVERSORES[definicion['tipo']](valores, vacia, definicion)
+        if 'defecto' in definicion:
+            convertidos = convertidos.where(~vacia, definicion['defecto'])
+        elif definicion.get('obligatoria'):
+            erronea = erronea | vacia
+        if erronea.any():
+            rechazadas.append(format_row_error(nombre, motivo, valores[erronea]))
+            invalida |= erronea
+        df[nombre] = convertidos
+
+    enteras = {nombre: DTYPE_CANTIDAD for nombre in df.columns if definiciones[nombre]['tipo'] in ('entero', 'entero_positivo')}
+    return df[~invalida].astype(enteras), rechazadas
+
+
+def _blank(valores):
+    # Solo las columnas de texto pueden traer celdas con espacios
+    if pd.api.types.is_numeric_dtype(valores) or pd.api.types.is_datetime64_any_dtype(valores):
+        return valores.isna()
+    return valores.isna() | (valores.astype(str).str.strip() == '')
+
+
+def format_row_error(nombre, motivo, valores):
+    """Mensaje de error de las filas de `valores` (índice del archivo) en la columna `nombre`."""
+    filas = [str(i + _PRIMERA_FILA) for i in valores.index[:MAX_FILAS_POR_ERROR]]
+    resto = len(valores) - len(filas)
+    etiqueta = ('Fila ' if len(valores) == 1 else 'Filas ') + ', '.join(filas) + (f" (y {resto} más)" if resto else '')
+    ejemplo = valores.iloc[0]
+    return f"{etiqueta}: {nombre} {motivo} (valor: '{'' if pd.isna(ejemplo) else ejemplo}')"
+
+
+# --- Conversores por tipo: (valores, vacia, definicion) -> (convertidos, erronea, motivo) ---
+# `erronea` no incluye las celdas vacías: validate_rows decide según 'defecto'/'obligatoria'
+
+def _id_values(valores, vacia, definicion):
+    ids = intern_ids(valores.astype(str).str.upper().str.strip().where(~vacia, ''))
+    return ids, pd.Series(False, index=valores.index), "vacío"
+
+
+def _text_values(valores, vacia, definicion):
+    return valores.astype(object), pd.Series(False, index=valores.index), "vacío"
+
+
+def _integer_values(valores, vacia, definicion, positivo=False):
+    numeros = pd.to_numeric(valores, errors='coerce')
+    if definicion.get('truncar'):
+        numeros = np.trunc(numeros)
+    erronea = ~vacia & (numeros.isna() | (numeros % 1 != 0))
+    if positivo:
+        erronea |= ~vacia & (numeros <= 0)
+    motivo = "debe ser un número entero mayor que cero" if positivo else "debe ser un número entero"
+    return numeros.where(~erronea & ~vacia), erronea, motivo
+
+
+def _date_values(valores, vacia, definicion):
+    fechas = pd.to_datetime(valores, errors='coerce')
+    return fechas, ~vacia & fechas.isna(), "no es una fecha válida"
+
+
+def _flag_values(valores, vacia, definicion):
+    if pd.api.types.is_bool_dtype(valores):
+        return valores.fillna(False).astype(bool), pd.Series(False, index=valores.index), ""
+    # row_key: los números leídos como float (1.0) cuentan como '1'
+    textos = valores.map(row_key, na_action='ignore').map(clean_col_name, na_action='ignore')
+    erronea = ~vacia & ~textos.isin(VALORES_SI | VALORES_NO)
+    return textos.isin(VALORES_SI), erronea, "debe ser 'sí' o 'no'"
+
+
+def _key_values(valores, vacia, definicion):
+    return valores.map(row_key).astype(object), pd.Series(False, index=valores.index), "vacía"
+
+
+def row_key(valor):
+    """Clave de línea como texto; las numéricas leídas como float (1001.0) quedan como '1001'."""
+    if pd.isna(valor) or str(valor).strip() == '':
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor).strip()
+
+
+_CONVERSORES = {
+    'id': _id_values,
+    'texto': _text_values,
+    'entero': _integer_values,
+    'entero_positivo': functools.partial(_integer_values, positivo=True),
+    'fecha': _date_values,
+    'clave': _key_values,
+    'bandera': _flag_values,
+}
@@ -0,0 +1,55 @@
+import pandas as pd
+
+from inventario.catalogo import plan_catalog_changes
+
+
+def test_plan_classifies_additions_changes_and_deletions():
+    df = pd.DataFrame({
+        'ID': ['a1', 'B2', 'n1', 'C3'],
+        'Producto': [None, 'Azúcar morena', 'Maicena', None],
+        'Stock Inicial': [None, 99, 4, None],
+        'Categoría': ['Harinas', None, 'Harinas', None],
+        'Eliminar': [None, None, None, 'sí'],
+    })
+    cambios, error = plan_catalog_changes({'A1', 'B2', 'C3'}, df)
+
+    assert error is None
+    assert cambios.altas[['ID', 'Producto', 'Stock']].values.tolist() == [['N1', 'Maicena', 4]]
+    # Las celdas vacías (o columnas ausentes) conservan el valor actual
+    df_cambios = cambios.cambios.where(cambios.cambios.notna(), None)
+    assert df_cambios.values.tolist() == [['A1', None, 'Harinas', None], ['B2', 'Azúcar morena', None, None]]
+    assert cambios.bajas == ['C3']
+    assert cambios.rechazadas == []
+    assert cambios.summary() == "1 altas, 2 cambios y 1 bajas"
+
+
+def test_plan_rejects_invalid_rows():
+    df = pd.DataFrame({
+        'ID': ['a1', 'a1', 'zz', 'n2', 'b2'],
+        'Producto': ['Harina', 'Otra', None, None, 'Azúcar'],
+        'Eliminar': [None, None, 'sí', None, None],
+    })
+    cambios, error = plan_catalog_changes(['A1', 'B2'], df, bajas=['b2', 'x9'])
+
+    assert error is None
+    assert cambios.bajas == ['B2']
+    assert cambios.cambios['ID'].tolist() == ['A1']
+    assert cambios.altas.empty
+    mensajes = ' | '.join(cambios.rechazadas)
+    assert "Fila 3: ID repetido" in mensajes
+    assert "Fila 4: ID no existe" in mensajes
+    assert "IDs a eliminar que no existen en el inventario: X9" in mensajes
+    assert "Fila 5: PRODUCTO vacío" in mensajes
+    assert "Fila 6: ID también está marcado para eliminar" in mensajes
+
+
+def test_plan_without_changes_is_empty():
+    cambios, error = plan_catalog_changes({'A1'})
+    assert error is None
+    assert cambios.empty
+
+
+def test_plan_missing_id_column():
+    cambios, error = plan_catalog_changes({'A1'}, pd.DataFrame({'Producto': ['Harina']}))
+    assert cambios.empty
+    assert "'ID'" in error
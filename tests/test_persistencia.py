@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from inventario.esquema import history_frame
+from inventario.persistencia import Ledger
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = Ledger(str(tmp_path / 'inventario.db'))
+    ledger.add_products(pd.DataFrame({
+        'ID': ['A', 'B'], 'Producto': ['Harina', 'Azúcar'], 'Stock': [10, 5],
+        'Categoría': 'Harinas', 'Presentación': 'libra', 'Ventas': 0, 'Compras': 0,
+    }))
+    return ledger
+
+
+def _movimientos(ids, cantidades):
+    return history_frame(pd.DataFrame({'ID': ids, 'Producto': ids, 'Cantidad': cantidades}))
+
+
+def test_load_changes_returns_movements_after_version(ledger):
+    ledger.record_movements('venta', _movimientos(['A'], [1]))
+    version = ledger.version()
+    ledger.record_movements('venta', _movimientos(['A', 'B'], [2, 1]))
+    ledger.record_movements('compra', _movimientos(['B'], [4]))
+
+    actual, df = ledger.load_changes(version, limite=100)
+    assert actual == ledger.version() == version + 2
+    assert df['tipo'].tolist() == ['venta', 'venta', 'compra']
+    assert df['ID'].tolist() == ['A', 'B', 'B']
+    assert df['Cantidad'].tolist() == [2, 1, 4]
+    assert (df['Sucursal'] == 'Principal').all()
+
+
+def test_load_changes_without_new_movements(ledger):
+    version = ledger.version()
+    actual, df = ledger.load_changes(version, limite=100)
+    assert actual == version
+    assert df.empty
+
+
+def test_load_changes_over_limit_asks_for_reload(ledger):
+    version = ledger.version()
+    ledger.record_movements('venta', _movimientos(['A', 'B', 'A'], [1, 1, 1]))
+    assert ledger.load_changes(version, limite=2)[1] is None
+    assert len(ledger.load_changes(version, limite=3)[1]) == 3
+
+
+def test_load_changes_after_catalog_change_asks_for_reload(ledger):
+    version = ledger.version()
+    ledger.record_movements('venta', _movimientos(['A'], [1]))
+    ledger.add_location('Norte')
+    actual, df = ledger.load_changes(version, limite=100)
+    assert actual == ledger.version()
+    assert df is None
+    # Desde la versión del cambio de catálogo sí se puede poner al día
+    ledger.record_movements('compra', _movimientos(['B'], [2]), 'Norte')
+    _, df = ledger.load_changes(actual, limite=100)
+    assert df[['tipo', 'ID', 'Sucursal']].values.tolist() == [['compra', 'B', 'Norte']]
+
+
+def test_load_changes_includes_transfers(ledger):
+    ledger.add_location('Norte')
+    version = ledger.version()
+    ledger.record_transfers('Principal', 'Norte', _movimientos(['A'], [3]))
+    _, df = ledger.load_changes(version, limite=100)
+    assert df[['ID', 'Cantidad', 'Sucursal', 'Destino']].values.tolist() == [['A', 3, 'Principal', 'Norte']]
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from inventario.validacion import resolve_columns, select_columns, validate_rows
+
+
+@pytest.mark.parametrize('cabecera', [
+    'Cantidad', 'cantidad ', 'Cant', 'Unidades', 'Cantidad Vendida', 'CANTIDAD_COMPRADA',
+    'Cant. Vendida', 'VENTA_CANTIDAD', 'Total Cantidad',
+])
+def test_quantity_header_variants(cabecera):
+    posiciones, error = resolve_columns(['Código', cabecera], 'movimientos')
+    assert error is None
+    assert posiciones == {0: 'ID', 1: 'CANTIDAD'}
+
+
+def test_exact_alias_wins_over_prefix_and_substring():
+    posiciones, error = resolve_columns(['ID', 'Total Cantidad', 'Cantidad_Vendida', 'Cantidad'], 'movimientos')
+    assert error is None
+    assert posiciones[3] == 'CANTIDAD'
+
+
+def test_missing_required_column():
+    posiciones, error = resolve_columns(['ID', 'Precio'], 'movimientos')
+    assert posiciones is None
+    assert "'CANTIDAD'" in error
+
+
+def test_select_columns_renames_and_orders_by_schema():
+    df = pd.DataFrame({'Folio': ['F1'], 'Cant. Vendida': [2], 'SKU': ['a1'], 'Precio': [9.5]}, index=[7])
+    df_esquema, error = select_columns(df, 'movimientos')
+    assert error is None
+    assert list(df_esquema.columns) == ['ID', 'CANTIDAD', 'CLAVE']
+    assert list(df_esquema.index) == [7]
+
+
+def test_validate_rows_converts_and_reports_rows():
+    df = pd.DataFrame({'ID': [' a1', 'B2', '', 'c3'], 'Cantidad': [3, 'dos', 1, 0]})
+    df_esquema, _ = select_columns(df, 'movimientos')
+    df_valido, rechazadas = validate_rows(df_esquema, 'movimientos')
+
+    assert df_valido['ID'].tolist() == ['A1']
+    assert df_valido['CANTIDAD'].tolist() == [3]
+    # La fila 2 de la hoja es la primera de datos
+    assert any(mensaje.startswith('Fila 4: ID') for mensaje in rechazadas)
+    assert any(mensaje.startswith('Filas 3, 5: CANTIDAD') for mensaje in rechazadas)
+
+
+def test_validate_rows_defaults_in_catalog():
+    df = pd.DataFrame({'ID': ['x1', 'x2'], 'Producto': ['Harina', None], 'Eliminar': ['sí', None]})
+    df_esquema, _ = select_columns(df, 'catalogo')
+    df_valido, rechazadas = validate_rows(df_esquema, 'catalogo')
+    assert rechazadas == []
+    assert df_valido['ELIMINAR'].tolist() == [True, False]
+    assert df_valido['PRODUCTO'].tolist() == ['Harina', None]
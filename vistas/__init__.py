@@ -0,0 +1,23 @@
+"""
+Ventanas de la app de Streamlit, una por módulo. app.py solo importa el módulo de la
+ventana elegida en el menú, de modo que plotly, el pronóstico o la lectura de los
+datos se cargan únicamente en las ventanas que los usan.
+"""
+import importlib
+
+# Ventana del menú -> módulo con su función render(), en el orden del menú
+VISTAS = {
+    'Dashboard': 'vistas.dashboard',
+    'Registro de Productos': 'vistas.productos',
+    'Registro de Ventas': 'vistas.ventas',
+    'Registro de Compras': 'vistas.compras',
+    'Carga de Movimientos': 'vistas.carga',
+    'Sucursales y Traslados': 'vistas.traslados',
+    'Reportes y Descarga': 'vistas.reportes',
+    'Configuración': 'vistas.configuracion',
+}
+
+
+def render(nombre):
+    """Importa (la primera vez) el módulo de la ventana `nombre` y la dibuja."""
+    importlib.import_module(VISTAS[nombre]).render()
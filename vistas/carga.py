@@ -0,0 +1,104 @@
+import os
+import tempfile
+
+import streamlit as st
+
+from inventario.movimientos import TIPOS_MOVIMIENTO
+from inventario.trabajos import OMITIDO, MovementImportJob
+from vistas.componentes import location_picker
+from vistas.sesion import ETIQUETAS_MOVIMIENTO, MOVIMIENTOS_MEMORY_LIMIT, ensure_session_data, get_ledger
+
+
+# Carpeta temporal de los archivos subidos mientras se importan en segundo plano
+CARGAS_DIR = os.path.join('.cache', 'cargas')
+
+
+def start_upload_job(tipo, archivo, sucursal):
+    """Guarda en disco un archivo subido y lanza su importación en segundo plano en `sucursal`."""
+    os.makedirs(CARGAS_DIR, exist_ok=True)
+    descriptor, path = tempfile.mkstemp(suffix=os.path.splitext(archivo.name)[1].lower(), dir=CARGAS_DIR)
+    with os.fdopen(descriptor, 'wb') as f:
+        f.write(archivo.getbuffer())
+    trabajo = MovementImportJob(
+        get_ledger(), tipo, path, nombre=archivo.name, borrar_al_terminar=True,
+        memory_limit=MOVIMIENTOS_MEMORY_LIMIT, sucursal=sucursal
+    )
+    st.session_state.setdefault('trabajos_carga', []).append(trabajo.start())
+
+
+def show_upload_jobs(trabajos):
+    """Muestra el avance o el resultado de cada importación en segundo plano."""
+    for trabajo in trabajos:
+        etiqueta, icono = ETIQUETAS_MOVIMIENTO[trabajo.tipo]
+        titulo = f"{icono} '{trabajo.nombre}' ({etiqueta}, {trabajo.sucursal})"
+        if not trabajo.done:
+            st.progress(trabajo.progreso, text=f"{titulo}: procesando...")
+        elif trabajo.estado == OMITIDO:
+            st.info(f"{titulo}: el archivo ya se había cargado; no se volvió a aplicar.")
+        else:
+            exitosas, fallidas, error = trabajo.resultado
+            if error:
+                st.error(f"{titulo}: {error}")
+            else:
+                st.success(f"{titulo}: {exitosas} {etiqueta} aplicadas.")
+            if fallidas:
+                st.warning(f"{titulo}: algunas {etiqueta} **FALLARON** (producto inexistente en el inventario o fila con datos inválidos) y no se procesaron: {'; '.join(fallidas)}")
+
+
+@st.fragment(run_every=1)
+def upload_jobs_live():
+    """
+    Refresca cada segundo el avance de las importaciones. Cuando termina alguna se
+    recarga la app completa, que toma el inventario nuevo del registro.
+    """
+    trabajos = st.session_state.trabajos_carga
+    show_upload_jobs(trabajos)
+    terminados = sum(trabajo.done for trabajo in trabajos)
+    if terminados != st.session_state.get('trabajos_terminados', 0):
+        st.session_state.trabajos_terminados = terminados
+        st.rerun()
+
+
+def render():
+    """Ventana de carga masiva de archivos de movimientos en segundo plano."""
+    # Los trabajos leen el inventario del registro: debe estar cargado el inventario inicial
+    ensure_session_data()
+    st.title("⬆️ Carga Masiva de Movimientos")
+    st.info("Los archivos se procesan en segundo plano: puede seguir registrando ventas y compras mientras tanto. Cada archivo se aplica completo o no se aplica.")
+
+    with st.form("carga_movimientos_form", clear_on_submit=True):
+        tipo_carga = st.radio(
+            "Tipo de movimiento:",
+            options=list(TIPOS_MOVIMIENTO),
+            format_func=lambda tipo: ETIQUETAS_MOVIMIENTO[tipo][0].capitalize(),
+            horizontal=True,
+            key="tipo_carga"
+        )
+        sucursal = location_picker("carga", label="Sucursal de los movimientos")
+        archivos_subidos = st.file_uploader(
+            "Archivos de movimientos (.xlsx o .csv) con columnas ID y Cantidad",
+            type=['xlsx', 'csv'],
+            accept_multiple_files=True,
+            key="archivos_carga"
+        )
+        submit_button = st.form_submit_button("Procesar Archivos")
+
+        if submit_button:
+            if archivos_subidos:
+                for archivo in archivos_subidos:
+                    start_upload_job(tipo_carga, archivo, sucursal)
+            else:
+                st.warning("No seleccionaste ningún archivo.")
+
+    trabajos = st.session_state.get('trabajos_carga', [])
+    if trabajos:
+        st.markdown("---")
+        st.subheader("Importaciones")
+        if not all(trabajo.done for trabajo in trabajos):
+            upload_jobs_live()
+        else:
+            show_upload_jobs(trabajos)
+            if st.button("Limpiar lista"):
+                st.session_state.trabajos_carga = []
+                st.session_state.trabajos_terminados = 0
+                st.rerun()
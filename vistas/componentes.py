@@ -0,0 +1,132 @@
+import streamlit as st
+import pandas as pd
+
+from inventario import metricas
+from inventario.almacen import LIMITE_BUSQUEDA
+from inventario.reportes import FORMATOS, cached_report
+from inventario.tablas import TAMANOS_PAGINA, cached_query, page_of
+from vistas.sesion import session_history
+
+# Periodos para filtrar los historiales: número de días hasta hoy (None: todo)
+PERIODOS_HISTORIAL = {'Todo': None, 'Hoy': 1, 'Últimos 7 días': 7, 'Últimos 30 días': 30}
+
+
+def paginated_dataframe(df, key, version):
+    """
+    Muestra un DataFrame por páginas con búsqueda, filtro por categoría y orden hechos
+    en el servidor: al navegador solo se envía la página visible. `version` debe
+    cambiar cuando cambian los datos de df.
+    """
+    col_buscar, col_categoria, col_orden, col_tamano = st.columns([3, 2, 2, 1])
+    with col_buscar:
+        texto = st.text_input("Buscar por ID o producto", key=f"{key}_buscar")
+    categoria = None
+    if 'Categoría' in df.columns:
+        with col_categoria:
+            categoria = st.selectbox(
+                "Categoría",
+                options=[None] + list(df['Categoría'].cat.categories),
+                format_func=lambda c: "Todas" if c is None else c,
+                key=f"{key}_categoria"
+            )
+    with col_orden:
+        orden = st.selectbox(
+            "Ordenar por",
+            options=[None] + list(df.columns),
+            format_func=lambda c: "Sin ordenar" if c is None else c,
+            key=f"{key}_orden"
+        )
+        descendente = st.checkbox("Descendente", key=f"{key}_descendente")
+    with col_tamano:
+        tamano = st.selectbox("Filas", options=TAMANOS_PAGINA, key=f"{key}_tamano")
+
+    resultado = cached_query(
+        st.session_state.setdefault(f"{key}_cache", {}), version, df,
+        texto=texto, categoria=categoria, orden=orden, ascendente=not descendente
+    )
+
+    total_paginas = max(1, -(-len(resultado) // tamano))
+    if st.session_state.get(f"{key}_pagina", 1) > total_paginas:
+        st.session_state[f"{key}_pagina"] = 1
+    pagina = st.number_input(f"Página (de {total_paginas})", min_value=1, max_value=total_paginas, step=1, key=f"{key}_pagina")
+
+    df_pagina, _ = page_of(resultado, pagina, tamano)
+    with metricas.section('tabla.serializacion'):
+        st.dataframe(df_pagina, use_container_width=True)
+    inicio = (pagina - 1) * tamano
+    st.caption(f"Mostrando {inicio + 1 if len(df_pagina) else 0}–{inicio + len(df_pagina)} de {len(resultado)} filas")
+
+def location_picker(key, todas=False, label="Sucursal"):
+    """
+    Selector de sucursal. Recuerda la última sucursal elegida en cualquier ventana.
+    Con `todas`, ofrece además "Todas las sucursales", que se devuelve como None.
+    """
+    opciones = ([None] if todas else []) + st.session_state.sucursales.names()
+    activa = st.session_state.get('sucursal_activa', opciones[0])
+    elegida = st.selectbox(
+        label,
+        options=opciones,
+        index=opciones.index(activa) if activa in opciones else 0,
+        format_func=lambda s: "Todas las sucursales" if s is None else s,
+        key=f"{key}_sucursal"
+    )
+    st.session_state.sucursal_activa = elegida
+    return elegida
+
+def product_picker(inventario, key):
+    """
+    Buscador de productos por ID o nombre (índice de búsqueda del inventario) y lista
+    con las coincidencias: al navegador solo se envían las sugerencias, no el catálogo
+    completo. Devuelve el ID elegido, o None si ningún producto coincide.
+    """
+    texto = st.text_input("Buscar producto por ID o nombre", key=f"{key}_busqueda", placeholder="Ej.: harina, 01-004")
+    resultados = inventario.search(texto)
+    if not resultados:
+        return None
+    if len(resultados) == LIMITE_BUSQUEDA:
+        st.caption(f"Se muestran las primeras {LIMITE_BUSQUEDA} coincidencias; escriba más para acotar la búsqueda.")
+    etiquetas = {pid: f"{inventario.get(pid)['Producto']} ({pid})" for pid in resultados}
+    return st.selectbox(
+        "Selecciona un producto:",
+        options=resultados,
+        format_func=etiquetas.get,
+        key=f"{key}_product_select"
+    )
+
+def history_table(tipo, key, sucursal=None):
+    """
+    Historial paginado de una sucursal (None: todas) con filtro de periodo: solo se
+    consultan las particiones diarias del periodo elegido.
+    """
+    historial = session_history(tipo, sucursal)
+    periodo = st.selectbox("Periodo", options=list(PERIODOS_HISTORIAL), key=f"{key}_periodo")
+    dias = PERIODOS_HISTORIAL[periodo]
+    inicio = None if dias is None else pd.Timestamp.today().normalize() - pd.Timedelta(days=dias - 1)
+    paginated_dataframe(historial.between(inicio), key, (sucursal, len(historial), inicio))
+
+def read_uploaded_table(archivo):
+    """Lee un archivo subido (.csv o .xlsx) en un DataFrame."""
+    if archivo.name.lower().endswith('.csv'):
+        return pd.read_csv(archivo)
+    return pd.read_excel(archivo)
+
+def report_download_button(label, nombre, df, version, formato):
+    """
+    Botón de descarga de un reporte. El archivo se genera al pulsar (en segundo plano)
+    y queda guardado por versión de los datos: repetir la descarga no lo regenera.
+    """
+    # Copia superficial: los cambios posteriores en el inventario no alteran este reporte
+    df = df.copy(deep=False)
+
+    def contenido():
+        with open(cached_report(nombre, version, df, formato), 'rb') as f:
+            return f.read()
+
+    st.download_button(
+        label,
+        data=contenido,
+        file_name=f"{nombre}.{formato}",
+        mime=FORMATOS[formato][1],
+        on_click='ignore',
+        key=f"descarga_{nombre}"
+    )
@@ -0,0 +1,57 @@
+import streamlit as st
+
+from vistas.componentes import history_table, location_picker, product_picker
+from vistas.sesion import ensure_session_data, register_movement
+
+
+def render():
+    """Ventana de registro de compras individuales e historial de compras."""
+    inventario = ensure_session_data()
+    st.title("🛒 Registro de Compras (Entradas)")
+
+    if inventario.empty:
+        st.info("No hay productos registrados. Añada productos para registrar compras.")
+    else:
+        st.header("Registrar una Compra")
+
+        # Búsqueda fuera del formulario: las sugerencias se actualizan al escribir
+        sucursal = location_picker("compra")
+        product_id = product_picker(inventario, "compra")
+        if product_id is None:
+            st.info("Ningún producto coincide con la búsqueda.")
+        else:
+            with st.form("registro_compra_form"):
+                producto_data = st.session_state.sucursales.store(sucursal).get(product_id)
+                current_stock = int(producto_data['Stock'])
+                presentation = producto_data['Presentación']
+
+                st.markdown("---")
+                col_left, col_right = st.columns(2)
+            
+                with col_left:
+                    cantidad_comprada = st.number_input(
+                        "Cantidad Comprada",
+                        min_value=1, 
+                        value=1, 
+                        step=1,
+                        key="cantidad_comprada_input"
+                    )
+            
+                with col_right:
+                    st.markdown(f"**Presentación:** `{presentation}`")
+                    st.markdown(f"**Stock en {sucursal}:** `{current_stock}`")
+
+                submit_button = st.form_submit_button("Registrar Compra")
+
+                if submit_button:
+                    if cantidad_comprada > 0:
+                        new_stock = register_movement('compra', product_id, cantidad_comprada, sucursal)
+                    
+                        st.success(f"Compra de {cantidad_comprada} unidades de '{producto_data['Producto']}' registrada con éxito. Nuevo stock: {new_stock}")
+                        st.rerun() 
+                    else:
+                        st.warning("La cantidad comprada debe ser mayor a cero.")
+
+        st.markdown("---")
+        st.subheader(f"Historial de Compras ({sucursal})")
+        history_table('compra', 'tabla_compras', sucursal)
@@ -0,0 +1,62 @@
+import streamlit as st
+import pandas as pd
+
+from inventario import metricas
+
+
+def render():
+    """Ventana de configuración: instrumentación de tiempos y sus mediciones."""
+    st.title("⚙️ Configuración")
+    st.header("⏱️ Instrumentación")
+
+    activa = st.toggle(
+        "Medir tiempos de carga, procesamiento, Dashboard y reportes (para todas las sesiones)",
+        value=metricas.is_enabled()
+    )
+    if activa != metricas.is_enabled():
+        metricas.enable(activa)
+        st.rerun()
+
+    datos_metricas = metricas.snapshot()
+    if not datos_metricas['habilitado']:
+        st.info(f"La instrumentación está desactivada y no tiene costo. También puede activarse al arrancar con la variable de entorno {metricas.VARIABLE_ENTORNO}=1.")
+
+    st.caption(f"Mediciones desde {datos_metricas['desde']}")
+    contadores = datos_metricas['contadores']
+    col1, col2 = st.columns(2)
+    with col1: st.metric("Ejecuciones de la app", contadores.get('app.ejecuciones', 0))
+    with col2: st.metric("Secciones medidas", len(datos_metricas['secciones']))
+
+    if datos_metricas['secciones']:
+        st.subheader("Latencia por sección")
+        st.dataframe(
+            pd.DataFrame(datos_metricas['secciones']).drop(columns='histograma'),
+            use_container_width=True,
+            hide_index=True
+        )
+        por_nombre = {seccion['seccion']: seccion for seccion in datos_metricas['secciones']}
+        seccion_elegida = st.selectbox("Histograma de:", options=list(por_nombre), key="metricas_seccion")
+        # Importación diferida: plotly solo se carga si hay algo que graficar
+        from inventario.dashboard import latency_figure
+        st.plotly_chart(latency_figure(por_nombre[seccion_elegida]), use_container_width=True)
+
+    if contadores:
+        st.subheader("Contadores")
+        st.dataframe(
+            pd.DataFrame(list(contadores.items()), columns=['Contador', 'Valor']),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    col_descarga, col_reinicio = st.columns(2)
+    with col_descarga:
+        st.download_button(
+            "Descargar mediciones (JSON)",
+            data=metricas.to_json(),
+            file_name="metricas.json",
+            mime="application/json"
+        )
+    with col_reinicio:
+        if st.button("Reiniciar mediciones"):
+            metricas.reset()
+            st.rerun()
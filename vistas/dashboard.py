@@ -0,0 +1,110 @@
+import streamlit as st
+
+from inventario import metricas
+from inventario.dashboard import dashboard_data
+from inventario.pronostico import DIAS_MINIMOS, PLAZO_ENTREGA_DIAS, UMBRAL_BAJO_STOCK, DemandForecast
+from vistas.componentes import location_picker
+from vistas.sesion import ensure_session_data, session_history
+
+
+def render():
+    """Ventana del Dashboard: KPIs, productos por reordenar y gráficos."""
+    inventario = ensure_session_data()
+    
+    st.title("📦 Control de Inventario - Distribuidora Universal del Llano")
+    st.header("📊 Dashboard de Inventario")
+
+    if inventario.empty:
+        st.info("No hay productos en el inventario. Añada productos desde 'Registro de Productos'.")
+    else:
+        # Una sucursal o todas: "todas" usa el inventario total, mantenido con cada
+        # movimiento, sin sumar los inventarios de las sucursales
+        sucursales = st.session_state.sucursales
+        sucursal = location_picker("dashboard", todas=True)
+        inventario = sucursales.store(sucursal)
+
+        # Pronóstico de demanda de la sesión por sucursal (conserva lo ya calculado entre
+        # recargas) y plazo de entrega por defecto
+        pronostico = st.session_state.setdefault('pronosticos', {}).setdefault(sucursal, DemandForecast())
+        if 'plazo_entrega' not in st.session_state:
+            st.session_state.plazo_entrega = PLAZO_ENTREGA_DIAS
+
+        plazo = st.number_input(
+            "Plazo de entrega del proveedor (días)", min_value=1, step=1, key="plazo_entrega",
+            help="Días que tarda en llegar un pedido. El punto de reorden cubre la demanda de este plazo más un stock de seguridad."
+        )
+        # KPIs mantenidos por el inventario; figuras y reorden en caché por versión
+        with metricas.section('dashboard.datos'):
+            datos = dashboard_data(
+                inventario, st.session_state.setdefault('dashboard_cache', {}).setdefault(sucursal, {}),
+                session_history('venta', sucursal), session_history('compra', sucursal), pronostico, plazo
+            )
+        df_bajo_stock = datos['bajo_stock']
+        figuras = datos['figuras']
+
+        # Mostrar KPIs
+        st.subheader("Indicadores Clave (KPIs)")
+        col1, col2, col3 = st.columns(3)
+        with col1: st.metric("Total de Productos Únicos", f"{inventario.aggregates.unique_products}")
+        with col2: st.metric("Total de Unidades en Stock", f"{inventario.aggregates.total_stock}")
+        with col3: st.metric("Productos por Reordenar", f"{len(df_bajo_stock)}", delta_color="inverse")
+
+        # Stock de cada sucursal, de los KPIs que mantiene cada una
+        if sucursal is None and len(sucursales.names()) > 1:
+            st.markdown("##### Stock por Sucursal")
+            st.dataframe(sucursales.summary(), use_container_width=True, hide_index=True)
+
+        st.markdown("---") 
+        
+        # Alerta de Bajo Stock: stock por debajo del punto de reorden de cada producto
+        st.subheader("🚨 Productos con Bajo Stock")
+        st.caption(
+            "Productos cuyo stock no cubre la demanda estimada durante el plazo de entrega, ordenados por días de cobertura. "
+            f"Los productos con menos de {DIAS_MINIMOS} días de ventas registradas aparecen si su stock es de {UMBRAL_BAJO_STOCK} unidades o menos."
+        )
+        if df_bajo_stock.empty:
+            st.success("¡Todo el inventario está por encima de su punto de reorden!")
+        else:
+            with metricas.section('dashboard.bajo_stock'):
+                st.dataframe(
+                    df_bajo_stock, 
+                    use_container_width=True,
+                    hide_index=True
+                )
+            
+        st.markdown("---") 
+        st.subheader("Visualizaciones y Movimientos")
+        viz_col1, viz_col2 = st.columns(2)
+
+        # Gráfico 1: Niveles de Stock por Producto
+        with viz_col1:
+            st.markdown("##### Top 10 Productos por Stock")
+            with metricas.section('dashboard.graficos'):
+                st.plotly_chart(figuras['stock'], use_container_width=True)
+
+        # Gráfico 2: Distribución de Productos por Categoría 
+        with viz_col2:
+            st.markdown("##### Distribución de Productos por Categoría")
+            with metricas.section('dashboard.graficos'):
+                st.plotly_chart(figuras['categoria'], use_container_width=True)
+
+        st.markdown("---") 
+        mov_col1, mov_col2 = st.columns(2)
+
+        # Gráfico 3: Top Productos Más Vendidos
+        with mov_col1:
+            st.markdown("##### Top 5 Productos Más Vendidos")
+            with metricas.section('dashboard.graficos'):
+                st.plotly_chart(figuras['ventas'], use_container_width=True)
+
+        # Gráfico 4: Top Productos Más Comprados
+        with mov_col2:
+            st.markdown("##### Top 5 Productos Más Comprados")
+            with metricas.section('dashboard.graficos'):
+                st.plotly_chart(figuras['compras'], use_container_width=True)
+
+        # Gráfico 5: Ventas por Mes (totales por periodo del historial)
+        st.markdown("---")
+        st.markdown("##### Ventas por Mes")
+        with metricas.section('dashboard.graficos'):
+            st.plotly_chart(figuras['ventas_mes'], use_container_width=True)
@@ -0,0 +1,139 @@
+import re
+
+import pandas as pd
+import streamlit as st
+
+from inventario.catalogo import plan_catalog_changes
+from inventario.esquema import CATEGORIA_OPCIONES, PRESENTACION_OPCIONES
+from vistas.componentes import location_picker, paginated_dataframe, read_uploaded_table
+from vistas.sesion import add_product, apply_catalog_changes, ensure_session_data
+
+# Columnas de la tabla editable del catálogo (cabeceras del esquema 'catalogo')
+COLUMNAS_TABLA_CATALOGO = ['ID', 'Producto', 'Stock Inicial', 'Categoría', 'Presentación', 'Eliminar']
+
+
+def catalog_batch(inventario):
+    """
+    Altas, cambios y bajas de productos por lotes desde un archivo o una tabla editable.
+    Todo el lote se valida de una vez contra los IDs del inventario, se muestra un
+    resumen y se aplica con una sola transacción y una sola recarga de la página.
+    """
+    mensaje = st.session_state.pop('catalogo_mensaje', None)
+    if mensaje:
+        st.success(mensaje)
+
+    st.caption(
+        "Las filas con un ID nuevo se añaden; las de un ID existente actualizan su nombre, categoría o "
+        "presentación (una celda vacía conserva el valor actual); las marcadas en 'Eliminar' se eliminan."
+    )
+    # Al aplicar un lote cambia la ronda: los widgets vuelven a empezar vacíos
+    ronda = st.session_state.setdefault('catalogo_ronda', 0)
+    origen = st.radio("Origen de los productos", options=["Archivo", "Tabla editable"], horizontal=True, key="catalogo_origen")
+
+    df_catalogo = None
+    if origen == "Archivo":
+        archivo = st.file_uploader(
+            "Archivo del catálogo (.xlsx o .csv) con columnas ID, Producto, Stock Inicial, Categoría, Presentación y, opcionalmente, Eliminar",
+            type=['xlsx', 'csv'],
+            key=f"catalogo_archivo_{ronda}"
+        )
+        if archivo is not None:
+            try:
+                df_catalogo = read_uploaded_table(archivo)
+            except Exception as e:
+                st.error(f"No se pudo leer el archivo '{archivo.name}'. Error: {e}")
+    else:
+        df_catalogo = st.data_editor(
+            pd.DataFrame(columns=COLUMNAS_TABLA_CATALOGO).astype({'Stock Inicial': 'Int64', 'Eliminar': 'boolean'}),
+            num_rows='dynamic',
+            column_config={
+                'Stock Inicial': st.column_config.NumberColumn(min_value=0, step=1),
+                'Categoría': st.column_config.SelectboxColumn(options=CATEGORIA_OPCIONES),
+                'Presentación': st.column_config.SelectboxColumn(options=PRESENTACION_OPCIONES),
+                'Eliminar': st.column_config.CheckboxColumn(),
+            },
+            use_container_width=True,
+            key=f"catalogo_tabla_{ronda}"
+        )
+
+    texto_bajas = st.text_area("IDs a eliminar (separados por comas o en líneas distintas)", key=f"catalogo_bajas_{ronda}")
+    bajas = [pid for pid in re.split(r'[,;\n]+', texto_bajas) if pid.strip()]
+
+    if (df_catalogo is None or df_catalogo.empty) and not bajas:
+        return
+    sucursal = location_picker("catalogo", label="Sucursal del stock inicial de los productos nuevos")
+
+    cambios, error = plan_catalog_changes(inventario.ids(), df_catalogo, bajas)
+    if error:
+        st.error(error)
+        return
+    if cambios.rechazadas:
+        st.warning(f"⚠️ Algunas filas o IDs no se aplicarán: {'; '.join(cambios.rechazadas)}")
+
+    col_altas, col_cambios, col_bajas = st.columns(3)
+    col_altas.metric("Altas", len(cambios.altas))
+    col_cambios.metric("Cambios", len(cambios.cambios))
+    col_bajas.metric("Bajas", len(cambios.bajas))
+    if not cambios.altas.empty:
+        with st.expander("Productos nuevos"):
+            st.dataframe(cambios.altas.head(100), use_container_width=True)
+    if not cambios.cambios.empty:
+        with st.expander("Productos que cambian"):
+            st.dataframe(cambios.cambios.head(100), use_container_width=True)
+    if cambios.bajas:
+        with st.expander("Productos que se eliminan"):
+            st.write(', '.join(cambios.bajas[:100]) + (f" (y {len(cambios.bajas) - 100} más)" if len(cambios.bajas) > 100 else ''))
+
+    if st.button("🔴 Aplicar Cambios al Catálogo", disabled=cambios.empty):
+        apply_catalog_changes(cambios, sucursal)
+        st.session_state.catalogo_mensaje = f"Catálogo actualizado: {cambios.summary()}."
+        st.session_state.catalogo_ronda = ronda + 1
+        st.rerun()
+
+
+
+def render():
+    """Ventana de registro manual, carga masiva y eliminación de productos."""
+    inventario = ensure_session_data()
+    st.title("📝 Registro de Productos")
+    st.header("Registro Manual de Productos")
+
+    # --- 1. FORMULARIO DE INGRESO MANUAL ---
+    with st.form("registro_producto_form"):
+        col_left, col_right = st.columns(2)
+
+        with col_left:
+            id_producto = st.text_input("Identificador del Producto (ID)", key="id_manual_input")
+            nombre_producto = st.text_input("Nombre del Producto", key="name_manual_input")
+        
+        with col_right:
+            categoria = st.selectbox("Categoría", options=CATEGORIA_OPCIONES, key="category_manual_input")
+            presentacion = st.selectbox("Presentación", options=PRESENTACION_OPCIONES, key="presentation_manual_input")
+
+        col_stock, col_sucursal = st.columns(2)
+        with col_stock:
+            stock_inicial = st.number_input("Stock Inicial", value=0, step=1, min_value=0, key="stock_manual_input")
+        with col_sucursal:
+            sucursal = location_picker("registro", label="Sucursal del stock inicial")
+
+        submit_button = st.form_submit_button("Añadir Producto Manualmente")
+        
+        if submit_button:
+            if not all([id_producto, nombre_producto, categoria, presentacion]):
+                st.error("Por favor, completa todos los campos para añadir el producto.")
+            else:
+                if id_producto in inventario:
+                    st.error(f"Error: El ID '{id_producto}' ya existe. Por favor, usa un ID único.")
+                else:
+                    add_product(id_producto.upper(), categoria, nombre_producto, presentacion, stock_inicial, sucursal)
+
+    # --- 2. CARGA MASIVA, CAMBIOS Y ELIMINACIÓN ---
+    st.markdown("---")
+    st.subheader("⚠️ Carga Masiva, Cambios y Eliminación de Productos")
+    catalog_batch(inventario)
+
+    # --- 3. INVENTARIO ACTUAL ---
+    st.markdown("---")
+    st.subheader("Inventario Actual")
+    store = st.session_state.sucursales.store(location_picker("tabla_inventario", todas=True))
+    paginated_dataframe(store.df, 'tabla_inventario', store.version)
@@ -0,0 +1,42 @@
+import streamlit as st
+
+from inventario.reportes import FORMATOS, available_formats
+from vistas.componentes import location_picker, report_download_button
+from vistas.sesion import ensure_session_data, get_ledger, session_history
+
+
+def render():
+    """Ventana de descarga del inventario y los historiales como reportes."""
+    ensure_session_data()
+    st.title("⬇️ Reportes y Descarga de Datos")
+    sucursal = location_picker("reportes", todas=True)
+    inventario = st.session_state.sucursales.store(sucursal)
+    ventas, compras = session_history('venta', sucursal), session_history('compra', sucursal)
+    # Nombre de los archivos: el de una sucursal lleva su nombre
+    sufijo = '' if sucursal is None else f"_{sucursal}"
+
+    # Versión del registro persistente: identifica los datos entre sesiones y reinicios
+    version_datos = f"{get_ledger().instance_id}-{st.session_state.inventario_version}"
+
+    formato = st.radio(
+        "Formato de descarga:",
+        options=available_formats(),
+        format_func=lambda f: FORMATOS[f][0],
+        horizontal=True,
+        key="formato_reporte"
+    )
+
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.subheader("📦 Inventario Actual")
+        st.caption(f"{len(inventario)} productos")
+        report_download_button("Descargar Inventario", f"inventario{sufijo}", inventario.df, version_datos, formato)
+    with col2:
+        st.subheader("💸 Historial de Ventas")
+        st.caption(f"{len(ventas)} registros")
+        report_download_button("Descargar Ventas", f"ventas{sufijo}", ventas.frame(), version_datos, formato)
+    with col3:
+        st.subheader("🛒 Historial de Compras")
+        st.caption(f"{len(compras)} registros")
+        report_download_button("Descargar Compras", f"compras{sufijo}", compras.frame(), version_datos, formato)
@@ -0,0 +1,382 @@
+import glob
+
+import streamlit as st
+import pandas as pd
+
+from inventario import metricas
+from inventario.cache import file_fingerprint, load_snapshot
+from inventario.esquema import COLUMNAS_INVENTARIO, SUCURSAL_PRINCIPAL, history_frame, normalize_id
+from inventario.historial import HistoryBuffer
+from inventario.movimientos import TIPOS_MOVIMIENTO, apply_transfers
+from inventario.persistencia import TIPO_TRASLADO, Ledger
+from inventario.sucursales import LocationInventory, process_location_movements
+
+# Base de datos local compartida por todas las sesiones (movimientos y stock)
+LEDGER_FILE_PATH = 'inventario.db'
+
+# Archivo del inventario inicial y archivos de movimientos que se cargan una sola vez:
+# un archivo de ventas y otro de compras por sucursal y mes (ventas_mes1.xlsx, ...)
+INVENTARIO_FILE_PATH = 'inventario_inicial.xlsx'
+VENTAS_FILE_PATTERN = 'ventas_mes*.xlsx'
+COMPRAS_FILE_PATTERN = 'compras_mes*.xlsx'
+
+# Memoria máxima por bloque al procesar archivos CSV de movimientos muy grandes
+MOVIMIENTOS_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# Texto e icono de los avisos de carga de cada tipo de movimiento
+ETIQUETAS_MOVIMIENTO = {'venta': ('ventas', '💸'), 'compra': ('compras', '🛒')}
+
+# Clave en st.session_state del historial de cada tipo de movimiento (de todas las
+# sucursales; el de una sucursal lleva además su nombre, ver _history_key)
+HIST_KEYS = {'venta': 'ventas_hist', 'compra': 'compras_hist'}
+
+# Movimientos de otras sesiones a partir de los cuales conviene recargar el inventario
+# completo en lugar de aplicarlos uno a uno (catch_up_session)
+MAX_MOVIMIENTOS_PENDIENTES = 1000
+
+
+@st.cache_resource
+def get_ledger():
+    """Registro persistente único para todo el proceso (compartido entre sesiones)."""
+    return Ledger(LEDGER_FILE_PATH)
+
+@metricas.timed('carga.sesion_desde_registro')
+def load_session_from_ledger():
+    """
+    Carga en la sesión el inventario guardado en el registro: el de cada sucursal y el
+    total (st.session_state.sucursales, LocationInventory; st.session_state.inventario
+    es el total). Los historiales se descartan y se vuelven a leer cuando alguna
+    ventana los pide (session_history).
+    """
+    version, df_total, por_sucursal = get_ledger().load_inventory_by_location()
+    st.session_state.sucursales = LocationInventory(df_total, por_sucursal)
+    st.session_state.inventario = st.session_state.sucursales.total
+    for clave in [clave for clave in st.session_state if str(clave).startswith(tuple(HIST_KEYS.values()))]:
+        del st.session_state[clave]
+    st.session_state.inventario_version = version
+
+@metricas.timed('carga.sesion_al_dia')
+def catch_up_session():
+    """
+    Pone al día la sesión con lo que otras sesiones escribieron en el registro desde la
+    última versión vista: sus movimientos se aplican con InventoryStore.adjust, sin
+    recargar el inventario. Si cambió el catálogo o hay demasiados movimientos, lo
+    recarga todo (load_session_from_ledger).
+    """
+    version, df_cambios = get_ledger().load_changes(st.session_state.inventario_version, MAX_MOVIMIENTOS_PENDIENTES)
+    if df_cambios is None:
+        load_session_from_ledger()
+        return
+
+    sucursales = st.session_state.sucursales
+    grupos = df_cambios.groupby(['tipo', 'Sucursal', 'Destino'], sort=False, dropna=False)
+    for (tipo, sucursal, destino), df in grupos:
+        totales = df.groupby('ID', sort=False)['Cantidad'].sum()
+        # El registro no actualiza el stock de IDs que no están en el inventario
+        totales = totales[[product_id in sucursales.total for product_id in totales.index]]
+        if tipo == TIPO_TRASLADO:
+            for product_id, cantidad in totales.items():
+                sucursales.transfer(sucursal, destino, product_id, int(cantidad))
+        else:
+            columna_acumulada, signo = TIPOS_MOVIMIENTO[tipo]
+            for product_id, cantidad in totales.items():
+                sucursales.adjust(sucursal, product_id, stock=signo * int(cantidad), **{columna_acumulada.lower(): int(cantidad)})
+            _extend_loaded_history(tipo, history_frame(df), sucursal)
+    st.session_state.inventario_version = version
+
+def _history_key(tipo, sucursal):
+    return HIST_KEYS[tipo] if sucursal is None else f"{HIST_KEYS[tipo]}_{sucursal}"
+
+def session_history(tipo, sucursal=None):
+    """
+    Historial (HistoryBuffer) de ventas o compras de la sesión, de una sucursal o (None)
+    de todas; se lee del registro la primera vez.
+    """
+    hist_key = _history_key(tipo, sucursal)
+    if hist_key not in st.session_state:
+        with metricas.section('carga.historial_desde_registro'):
+            st.session_state[hist_key] = HistoryBuffer(get_ledger().load_history(tipo, sucursal))
+    return st.session_state[hist_key]
+
+def session_transfers():
+    """
+    Historial de traslados de la sesión y su versión (el último traslado registrado):
+    solo se vuelve a leer del registro cuando hay traslados nuevos.
+    """
+    ledger = get_ledger()
+    ultimo = ledger.last_movement(TIPO_TRASLADO)
+    if st.session_state.get('traslados_hist', (None,))[0] != ultimo:
+        st.session_state.traslados_hist = (ultimo, ledger.load_transfers())
+    return st.session_state.traslados_hist
+
+def _loaded_histories(tipo, sucursal):
+    # Un historial aún no leído no se toca: al leerlo ya trae los movimientos nuevos
+    claves = (_history_key(tipo, None), _history_key(tipo, sucursal))
+    return [st.session_state[clave] for clave in claves if clave in st.session_state]
+
+def _extend_loaded_history(tipo, df_hist_new, sucursal):
+    for historial in _loaded_histories(tipo, sucursal):
+        historial.extend(df_hist_new)
+
+def sync_session(version_anterior, version_nueva, aplicar_en_sesion):
+    """
+    Refleja en la sesión una escritura ya confirmada en el registro.
+    Si nadie más escribió entre medias, aplica el cambio en memoria; si otra sesión
+    escribió, se pone al día con el registro (catch_up_session), que ya incluye esta
+    escritura, para no perder sus movimientos.
+    """
+    if version_anterior == st.session_state.inventario_version:
+        aplicar_en_sesion()
+        st.session_state.inventario_version = version_nueva
+    else:
+        catch_up_session()
+
+def ensure_session_data():
+    """
+    Prepara los datos que usan las ventanas: la primera vez, carga en el registro los
+    archivos iniciales; en cada ejecución, pone al día el inventario de la sesión si
+    otra sesión escribió en el registro. Devuelve el inventario total (InventoryStore); el de
+    cada sucursal está en st.session_state.sucursales.
+    Solo la llaman las ventanas que muestran datos, para que el resto abra sin leerlos.
+    """
+    ledger = get_ledger()
+
+    # La carga desde archivos se hace una sola vez para todas las sesiones: después
+    # el inventario se lee directamente del registro persistente. El candado solo
+    # cubre esa carga inicial (las banderas se vuelven a comprobar dentro de él).
+    # === 1. LÓGICA DE CARGA AUTOMÁTICA DEL INVENTARIO INICIAL ===
+    # Si el archivo no existe, la sesión no lo vuelve a buscar (ni repite el aviso)
+    if (not st.session_state.get('inventario_inicial_intentado')
+            and not ledger.get_flag('inventario_inicial_cargado') and not ledger.has_inventory()):
+        with ledger.bootstrap_lock:
+            if not ledger.get_flag('inventario_inicial_cargado') and not ledger.has_inventory():
+                _load_initial_inventory(ledger)
+
+    # Inventario de la sesión: se carga la primera vez y se pone al día si otra
+    # sesión escribió en el registro. Fuera del candado: las transacciones del
+    # registro ya ordenan a los escritores
+    if 'sucursales' not in st.session_state:
+        load_session_from_ledger()
+    elif st.session_state.inventario_version != ledger.version():
+        catch_up_session()
+
+    # === 2. LÓGICA DE CARGA AUTOMÁTICA DE MOVIMIENTOS (Solo se ejecuta UNA VEZ) ===
+    # La bandera queda guardada en el registro para evitar la doble carga de movimientos
+    if not ledger.get_flag('movimientos_iniciales_cargados') and not st.session_state.inventario.empty:
+        with ledger.bootstrap_lock:
+            if not ledger.get_flag('movimientos_iniciales_cargados'):
+                _load_initial_movements()
+                # Establecer la bandera para que no se vuelva a ejecutar
+                ledger.set_flag('movimientos_iniciales_cargados')
+
+    return st.session_state.inventario
+
+def _load_initial_inventory(ledger):
+    from inventario.importacion import read_initial_inventory
+
+    try:
+        # Inicializar el inventario base (copia ya procesada si el archivo no cambió)
+        with metricas.section('carga.inventario_inicial'):
+            df_cargado, rechazadas = load_snapshot(INVENTARIO_FILE_PATH, read_initial_inventory)
+
+        ledger.add_products(df_cargado)
+        ledger.set_flag('inventario_inicial_cargado')
+        st.toast("✅ Inventario base cargado desde archivo inicial.", icon="📦")
+        if rechazadas:
+            st.warning(f"⚠️ Algunos productos de '{INVENTARIO_FILE_PATH}' no se cargaron por datos inválidos: {'; '.join(rechazadas)}")
+
+    except FileNotFoundError:
+        st.session_state.inventario_inicial_intentado = True
+        st.warning(f"No se encontró '{INVENTARIO_FILE_PATH}'. Iniciando con inventario vacío.")
+
+    except Exception as e:
+        # Este error es típicamente por falta de 'openpyxl' si el archivo es .xlsx
+        st.error(f"Error al cargar el archivo de inventario. Revise el formato (ID, Producto, Stock Inicial, Categoría, Presentación). Error: {e}")
+
+def _load_initial_movements():
+    archivos = (
+        [('venta', path) for path in sorted(glob.glob(VENTAS_FILE_PATTERN))]
+        + [('compra', path) for path in sorted(glob.glob(COMPRAS_FILE_PATTERN))]
+    )
+    try:
+        for (tipo, path), resultado in zip(archivos, import_movement_files_to_session(archivos)):
+            report_movement_result(tipo, path, resultado)
+    except Exception as e:
+        st.warning(f"No se pudieron cargar los archivos de movimientos. Error: {e}")
+
+@metricas.timed('registro.sucursal')
+def add_location(nombre):
+    """Crea una sucursal sin stock."""
+    anterior, nueva = get_ledger().add_location(nombre)
+    sync_session(anterior, nueva, lambda: st.session_state.sucursales.add_location(nombre))
+
+@metricas.timed('registro.producto')
+def add_product(new_id, new_category, new_name, new_presentation, new_stock, sucursal=SUCURSAL_PRINCIPAL):
+    """Añade un nuevo producto al inventario, con su stock inicial en `sucursal`."""
+    new_id = normalize_id(new_id)
+    producto = {
+        'ID': new_id,
+        'Producto': new_name,
+        'Stock': new_stock,
+        'Categoría': new_category,
+        'Presentación': new_presentation,
+        'Ventas': 0,
+        'Compras': 0
+    }
+    anterior, nueva = get_ledger().add_products(pd.DataFrame([producto], columns=COLUMNAS_INVENTARIO), sucursal)
+    sync_session(anterior, nueva, lambda: st.session_state.sucursales.add(producto, sucursal))
+    st.success(f"Producto '{new_name}' (ID: {new_id}) añadido con éxito!")
+
+@metricas.timed('registro.catalogo')
+def apply_catalog_changes(cambios, sucursal=SUCURSAL_PRINCIPAL):
+    """
+    Aplica un lote del catálogo (inventario.catalogo.CatalogChanges): altas, cambios y
+    bajas se guardan en una sola transacción y la sesión se actualiza una sola vez. El
+    stock inicial de las altas queda en `sucursal`.
+    """
+    anterior, nueva = get_ledger().apply_catalog_changes(cambios.altas, cambios.cambios, cambios.bajas, sucursal)
+    sync_session(anterior, nueva, lambda: st.session_state.sucursales.apply_changes(
+        cambios.altas, cambios.cambios, cambios.bajas, sucursal
+    ))
+
+@metricas.timed('registro.movimiento')
+def register_movement(tipo, product_id, cantidad, sucursal=SUCURSAL_PRINCIPAL):
+    """Registra una venta o compra individual en `sucursal` y devuelve el nuevo stock del producto en ella."""
+    columna_acumulada, signo = TIPOS_MOVIMIENTO[tipo]
+    sucursales = st.session_state.sucursales
+    producto = sucursales.total.get(product_id)
+    df_hist_new = history_frame(pd.DataFrame([{'ID': producto['ID'], 'Producto': producto['Producto'], 'Cantidad': cantidad}]))
+
+    def aplicar_en_sesion():
+        sucursales.adjust(sucursal, product_id, stock=signo * cantidad, **{columna_acumulada.lower(): cantidad})
+        for historial in _loaded_histories(tipo, sucursal):
+            historial.append(producto['ID'], producto['Producto'], cantidad, df_hist_new.at[0, 'Fecha'])
+
+    anterior, nueva = get_ledger().record_movements(tipo, df_hist_new, sucursal)
+    sync_session(anterior, nueva, aplicar_en_sesion)
+    return st.session_state.sucursales.store(sucursal).get(product_id)['Stock']
+
+@metricas.timed('registro.traslado')
+def register_transfer(product_id, cantidad, origen, destino):
+    """Registra el traslado de `cantidad` unidades de un producto entre dos sucursales."""
+    sucursales = st.session_state.sucursales
+    producto = sucursales.total.get(product_id)
+    df_hist_new = history_frame(pd.DataFrame([{'ID': producto['ID'], 'Producto': producto['Producto'], 'Cantidad': cantidad}]))
+    anterior, nueva = get_ledger().record_transfers(origen, destino, df_hist_new)
+    sync_session(anterior, nueva, lambda: sucursales.transfer(origen, destino, product_id, cantidad))
+
+# --- FUNCIONES DE PROCESAMIENTO MASIVO (USADAS TAMBIÉN PARA CARGA INICIAL) ---
+
+def _process_movements_from_df(df_movimientos, tipo, sucursal):
+    """Aplica un lote de movimientos al inventario de una sucursal de la sesión y amplía sus historiales ya leídos."""
+    # Las líneas con una CLAVE ya registrada se omiten: cargar dos veces no duplica
+    return process_location_movements(
+        get_ledger(), st.session_state.sucursales, df_movimientos, tipo, sucursal,
+        historiales=_loaded_histories(tipo, sucursal), sincronizar=sync_session
+    )
+
+
+@metricas.timed('proceso.ventas')
+def process_sales_from_df(df_ventas_new, sucursal=SUCURSAL_PRINCIPAL):
+    """
+    Procesa un DataFrame de ventas de una sucursal (carga masiva o inicial).
+    IMPORTANTE: Solo procesa IDs que existen en el inventario.
+    """
+    return _process_movements_from_df(df_ventas_new, 'venta', sucursal)
+
+
+@metricas.timed('proceso.compras')
+def process_purchases_from_df(df_compras_new, sucursal=SUCURSAL_PRINCIPAL):
+    """
+    Procesa un DataFrame de compras de una sucursal (carga masiva o inicial).
+    IMPORTANTE: Solo procesa IDs que existen en el inventario.
+    """
+    return _process_movements_from_df(df_compras_new, 'compra', sucursal)
+
+
+@metricas.timed('proceso.traslados')
+def process_transfers_from_df(df_traslados, origen, destino):
+    """
+    Procesa un DataFrame de traslados (ID, Cantidad) de la sucursal `origen` a `destino`
+    en una sola transacción; las líneas que superan el stock del origen se rechazan
+    (apply_transfers). Devuelve (exitosas, fallidas, error) como process_sales_from_df.
+    """
+    sucursales = st.session_state.sucursales
+    exitosas, fallidas, error, df_origen, df_destino, df_hist_new = apply_transfers(
+        sucursales.store(origen).df, sucursales.store(destino).df, df_traslados
+    )
+    if error:
+        return 0, [], error
+    if df_hist_new is not None:
+        anterior, nueva = get_ledger().record_transfers(origen, destino, df_hist_new)
+        sync_session(anterior, nueva, lambda: sucursales.replace_transfer(origen, df_origen, destino, df_destino))
+    return exitosas, fallidas, None
+
+
+@metricas.timed('carga.archivo_movimientos')
+@metricas.timed('carga.movimientos')
+def import_movement_files_to_session(archivos, sucursal=SUCURSAL_PRINCIPAL):
+    """
+    Importa varios archivos de movimientos [(tipo, ruta), ...] de una sucursal al inventario de la sesión.
+    Los archivos se leen en paralelo y todos sus movimientos se guardan en una sola
+    transacción. Devuelve un resultado
+    (exitosas, fallidas, error) por archivo, en el mismo orden, o None si el archivo
+    ya se había aplicado (misma huella de contenido) y se omitió sin leerlo.
+    """
+    # Importación diferida: el pool de procesos solo se usa en la carga inicial
+    from inventario.importacion import import_movement_files
+
+    sucursales = st.session_state.sucursales
+    inventario = sucursales.store(sucursal)
+    if inventario.empty:
+        return [(0, [], "El inventario base está vacío.")] * len(archivos)
+
+    ledger = get_ledger()
+    resultados = {}
+    huellas = {}
+    for tipo, path in archivos:
+        huellas[(tipo, path)] = file_fingerprint(path)
+        if ledger.file_applied(huellas[(tipo, path)], tipo):
+            resultados[(tipo, path)] = None
+
+    pendientes = [archivo for archivo in archivos if archivo not in resultados]
+    if pendientes:
+        resultados_lote, df_inventario_nuevo, historiales = import_movement_files(
+            inventario.df, pendientes, applied_keys=ledger.applied_keys
+        )
+        resultados.update(zip(pendientes, resultados_lote))
+        # Los archivos leídos sin error quedan registrados junto con sus movimientos
+        aplicados = [
+            (huellas[(tipo, path)], tipo, path)
+            for (tipo, path), (_, _, error) in zip(pendientes, resultados_lote) if not error
+        ]
+
+        if df_inventario_nuevo is not None:
+            def aplicar_en_sesion():
+                sucursales.replace_location(sucursal, df_inventario_nuevo)
+                for tipo, df_hist_new in historiales.items():
+                    _extend_loaded_history(tipo, df_hist_new, sucursal)
+
+            anterior, nueva = ledger.record_movement_batches(historiales, archivos=aplicados, sucursal=sucursal)
+            sync_session(anterior, nueva, aplicar_en_sesion)
+        elif aplicados:
+            ledger.record_files(aplicados)
+
+    return [resultados[archivo] for archivo in archivos]
+
+
+def report_movement_result(tipo, path, resultado):
+    """Muestra los avisos de la carga de un archivo de movimientos."""
+    etiqueta, icono = ETIQUETAS_MOVIMIENTO[tipo]
+    if resultado is None:
+        st.info(f"El archivo de {etiqueta} '{path}' ya se había cargado; no se volvió a aplicar.")
+        return
+    exitosas, fallidas, error = resultado
+
+    if error:
+         st.warning(f"Error en el archivo '{path}': {error}")
+
+    if exitosas > 0:
+        st.toast(f"✅ {exitosas} {etiqueta} procesadas automáticamente desde '{path}'.", icon=icono)
+    if fallidas:
+        st.warning(f"⚠️ Algunas {etiqueta} de '{path}' **FALLARON** (producto inexistente en el inventario o fila con datos inválidos) y no se procesaron: {'; '.join(fallidas)}")
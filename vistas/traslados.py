@@ -0,0 +1,95 @@
+import streamlit as st
+
+from vistas.componentes import paginated_dataframe, product_picker, read_uploaded_table
+from vistas.sesion import (
+    add_location, ensure_session_data, process_transfers_from_df, register_transfer, session_transfers
+)
+
+
+def render():
+    """Ventana de sucursales: stock por sucursal, alta de sucursales y traslados entre ellas."""
+    inventario = ensure_session_data()
+    sucursales = st.session_state.sucursales
+    st.title("🏬 Sucursales y Traslados")
+
+    mensaje = st.session_state.pop('traslado_mensaje', None)
+    if mensaje:
+        st.success(mensaje)
+
+    # --- 1. SUCURSALES ---
+    st.header("Sucursales")
+    st.dataframe(sucursales.summary(), use_container_width=True, hide_index=True)
+
+    with st.form("registro_sucursal_form", clear_on_submit=True):
+        nombre = st.text_input("Nombre de la nueva sucursal", key="sucursal_nueva_input")
+        if st.form_submit_button("Añadir Sucursal"):
+            nombre = nombre.strip()
+            if not nombre:
+                st.error("Escribe el nombre de la sucursal.")
+            elif nombre.casefold() in {s.casefold() for s in sucursales.names()}:
+                st.error(f"Error: La sucursal '{nombre}' ya existe.")
+            else:
+                add_location(nombre)
+                st.session_state.traslado_mensaje = f"Sucursal '{nombre}' creada."
+                st.rerun()
+
+    # --- 2. TRASLADOS ---
+    st.markdown("---")
+    st.header("Traslados entre Sucursales")
+    if len(sucursales.names()) < 2:
+        st.info("Crea al menos otra sucursal para registrar traslados.")
+        return
+    if inventario.empty:
+        st.info("No hay productos registrados. Añada productos para registrar traslados.")
+        return
+
+    col_origen, col_destino = st.columns(2)
+    with col_origen:
+        origen = st.selectbox("Sucursal de origen", options=sucursales.names(), key="traslado_origen")
+    with col_destino:
+        destinos = [nombre for nombre in sucursales.names() if nombre != origen]
+        destino = st.selectbox("Sucursal de destino", options=destinos, key="traslado_destino")
+
+    st.subheader("Traslado Individual")
+    product_id = product_picker(inventario, "traslado")
+    if product_id is None:
+        st.info("Ningún producto coincide con la búsqueda.")
+    else:
+        with st.form("registro_traslado_form"):
+            stock_origen = int(sucursales.store(origen).get(product_id)['Stock'])
+            st.markdown(f"**Stock en {origen}:** `{stock_origen}` · **Stock en {destino}:** `{int(sucursales.store(destino).get(product_id)['Stock'])}`")
+            cantidad = st.number_input("Cantidad a trasladar", min_value=1, value=1, step=1, key="cantidad_traslado_input")
+            if st.form_submit_button("Registrar Traslado"):
+                if cantidad > stock_origen:
+                    st.error(f"No hay stock suficiente en {origen}: hay {stock_origen} unidades.")
+                else:
+                    register_transfer(product_id, cantidad, origen, destino)
+                    st.session_state.traslado_mensaje = f"Traslado de {cantidad} unidades de {origen} a {destino} registrado."
+                    st.rerun()
+
+    st.subheader("Traslado Masivo")
+    with st.form("carga_traslados_form", clear_on_submit=True):
+        archivo = st.file_uploader(
+            f"Archivo de traslados de {origen} a {destino} (.xlsx o .csv) con columnas ID y Cantidad",
+            type=['xlsx', 'csv'],
+            key="archivo_traslados"
+        )
+        if st.form_submit_button("Procesar Traslados"):
+            if archivo is None:
+                st.warning("No seleccionaste ningún archivo.")
+            else:
+                try:
+                    exitosas, fallidas, error = process_transfers_from_df(read_uploaded_table(archivo), origen, destino)
+                except Exception as e:
+                    exitosas, fallidas, error = 0, [], f"No se pudo leer el archivo. Error: {e}"
+                if error:
+                    st.error(f"Error en el archivo '{archivo.name}': {error}")
+                if fallidas:
+                    st.warning(f"⚠️ Algunos traslados de '{archivo.name}' **FALLARON** (producto inexistente en el inventario, fila con datos inválidos o sin stock suficiente en el origen) y no se procesaron: {'; '.join(fallidas)}")
+                if exitosas:
+                    st.success(f"✅ {exitosas} traslados de {origen} a {destino} procesados desde '{archivo.name}'.")
+
+    st.markdown("---")
+    st.subheader("Historial de Traslados")
+    version_traslados, df_traslados = session_transfers()
+    paginated_dataframe(df_traslados, 'tabla_traslados', version_traslados)
@@ -0,0 +1,61 @@
+import streamlit as st
+
+from vistas.componentes import history_table, location_picker, product_picker
+from vistas.sesion import ensure_session_data, register_movement
+
+
+def render():
+    """Ventana de registro de ventas individuales e historial de ventas."""
+    inventario = ensure_session_data()
+    st.title("💸 Registro de Ventas")
+
+    if inventario.empty:
+        st.info("No hay productos registrados. Añada productos para registrar ventas.")
+    else:
+        st.header("Registro de Venta Individual")
+        
+        # Búsqueda fuera del formulario: las sugerencias se actualizan al escribir
+        sucursal = location_picker("venta")
+        product_id = product_picker(inventario, "venta")
+        if product_id is None:
+            st.info("Ningún producto coincide con la búsqueda.")
+        else:
+            with st.form("registro_venta_form"):
+                producto_data = st.session_state.sucursales.store(sucursal).get(product_id)
+                current_stock = int(producto_data['Stock'])
+                presentation = producto_data['Presentación']
+
+                st.markdown("---")
+                col_left, col_right = st.columns(2)
+            
+                with col_left:
+                    cantidad_vendida = st.number_input(
+                        "Cantidad Vendida",
+                        min_value=1, 
+                        value=1, 
+                        step=1,
+                        key="cantidad_vendida_input",
+                        help="Si la cantidad es mayor al stock actual, el stock se volverá negativo."
+                    )
+            
+                with col_right:
+                    st.markdown(f"**Presentación:** `{presentation}`")
+                    st.markdown(f"**Stock en {sucursal}:** `{current_stock}`")
+
+                submit_button = st.form_submit_button("Registrar Venta")
+
+                if submit_button:
+                    if cantidad_vendida > 0:
+                        new_stock = register_movement('venta', product_id, cantidad_vendida, sucursal)
+                    
+                        if new_stock < 0:
+                            st.warning(f"⚠️ Venta de {cantidad_vendida} unidades registrada. El stock es NEGATIVO: {new_stock}")
+                        else:
+                             st.success(f"Venta de {cantidad_vendida} unidades registrada. Nuevo stock: {new_stock}")
+                        st.rerun() 
+                    else:
+                        st.warning("La cantidad vendida debe ser mayor a cero.")
+
+        st.markdown("---")
+        st.subheader(f"Historial de Ventas ({sucursal})")
+        history_table('venta', 'tabla_ventas', sucursal)